@@ -0,0 +1,162 @@
+"""
+쿼리 결과 출력 형식 (formatter) 모음
+
+각 형식은 FORMATTERS에 이름으로 등록되며, 행을 하나씩 받아 바로 파일에 쓴다.
+Sink는 출력 파일 하나 = 형식 하나 + 선택한 열이고, 결과셋을 한 번 읽으면서 여러 Sink에 나눠 쓴다.
+
+    sinks = [Sink(file, 'csv', column_names, ['phoneNo', 'email'])]
+    for row in rows:
+        for sink in sinks:
+            sink.write(row)
+    for sink in sinks:
+        sink.close()
+
+열은 이름 또는 위치(0부터)로 선택하며, 생략하면 모든 열.
+"""
+import csv
+import json
+
+FORMATTERS = {}
+
+
+def register_formatter(name):
+    """@register_formatter('이름')으로 형식 등록"""
+    def decorator(cls):
+        FORMATTERS[name] = cls
+        return cls
+    return decorator
+
+
+class Formatter:
+    """file에 행을 하나씩 쓰는 형식의 기본 클래스 (names: 선택한 열 이름)"""
+
+    def __init__(self, file, names, **options):
+        self.file = file
+        self.names = names
+
+    def write(self, values):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+@register_formatter('list')
+class QuotedListFormatter(Formatter):
+    """큰따옴표로 감싼 값을 ',\\n'으로 구분 (마지막 행 뒤에는 구분자 없음), 열이 여러 개면 ', '로 연결"""
+
+    def __init__(self, file, names, **options):
+        super().__init__(file, names)
+        self._first = True
+
+    def write(self, values):
+        if not self._first:
+            self.file.write(',\n')
+        self._first = False
+        self.file.write(', '.join('"' + str(value) + '"' for value in values))
+
+
+@register_formatter('hashmap')
+class JavaHashMapFormatter(Formatter):
+    """
+    한 행에 Java 코드 한 줄: map = new HashMap<>();map.put("키", "값");...list.add(map);
+    keys를 주면 열 이름 대신 그 값을 Map 키로 사용
+    """
+
+    def __init__(self, file, names, keys=None, **options):
+        super().__init__(file, names)
+        self.keys = keys or names
+        if len(self.keys) != len(names):
+            raise ValueError(f"hashmap keys 수({len(self.keys)})가 열 수({len(names)})와 다릅니다")
+
+    def write(self, values):
+        puts = ''.join('map.put("' + key + '", "' + str(value) + '");' for key, value in zip(self.keys, values))
+        self.file.write('map = new HashMap<>();' + puts + 'list.add(map);\n')
+
+
+@register_formatter('csv')
+class CsvFormatter(Formatter):
+    """첫 줄은 열 이름 (줄바꿈은 파일을 연 방식을 따름)"""
+
+    def __init__(self, file, names, **options):
+        super().__init__(file, names)
+        self.writer = csv.writer(file, lineterminator='\n')
+        self.writer.writerow(names)
+
+    def write(self, values):
+        self.writer.writerow(values)
+
+
+@register_formatter('jsonl')
+class JsonLinesFormatter(Formatter):
+    """한 줄에 {"열 이름": 값, ...} 하나"""
+
+    def write(self, values):
+        self.file.write(json.dumps(dict(zip(self.names, values)), ensure_ascii=False, default=str) + '\n')
+
+
+@register_formatter('columnar')
+class ColumnarFormatter(Formatter):
+    """
+    Parquet처럼 row_group_size 행씩 묶어 열 단위로 저장 (JSON Lines)
+    한 줄 = {"rows": 행 수, "columns": {"열 이름": [값, ...], ...}}
+    메모리에는 한 묶음만 둔다
+    """
+
+    def __init__(self, file, names, row_group_size=10000, **options):
+        super().__init__(file, names)
+        self.row_group_size = row_group_size
+        self._columns = [[] for _ in names]
+        self._rows = 0
+
+    def write(self, values):
+        for column, value in zip(self._columns, values):
+            column.append(value)
+        self._rows += 1
+        if self._rows >= self.row_group_size:
+            self._flush()
+
+    def _flush(self):
+        if not self._rows:
+            return
+        group = {'rows': self._rows, 'columns': dict(zip(self.names, self._columns))}
+        self.file.write(json.dumps(group, ensure_ascii=False, default=str) + '\n')
+        self._columns = [[] for _ in self.names]
+        self._rows = 0
+
+    def close(self):
+        self._flush()
+
+
+def resolve_columns(column_names, selection=None):
+    """선택한 열(이름 또는 위치)을 위치 목록으로, 생략하면 모든 열"""
+    if not selection:
+        return list(range(len(column_names)))
+    indexes = []
+    for column in selection:
+        if isinstance(column, int):
+            if not 0 <= column < len(column_names):
+                raise ValueError(f"열 위치 {column}이(가) 범위를 벗어났습니다 (열 {len(column_names)}개)")
+            indexes.append(column)
+        elif column in column_names:
+            indexes.append(column_names.index(column))
+        else:
+            raise ValueError(f"열 '{column}'이(가) 없습니다, 결과셋 열: {', '.join(column_names)}")
+    return indexes
+
+
+class Sink:
+    """출력 파일 하나: 행에서 선택한 열만 골라 formatter에 넘김"""
+
+    def __init__(self, file, format_name, column_names, columns=None, **options):
+        if format_name not in FORMATTERS:
+            raise ValueError(f"알 수 없는 형식: {format_name} (사용 가능: {', '.join(FORMATTERS)})")
+        self.indexes = resolve_columns(column_names, columns)
+        names = [column_names[i] for i in self.indexes]
+        self.formatter = FORMATTERS[format_name](file, names, **options)
+
+    def write(self, row):
+        self.formatter.write([row[i] for i in self.indexes])
+
+    def close(self):
+        self.formatter.close()
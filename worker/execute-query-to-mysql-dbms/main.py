@@ -1,6 +1,9 @@
+from contextlib import ExitStack
+
 import mysql.connector
 
 from db import datasource
+from formatters import Sink
 '''
 datasource 딕셔너리를 db.py에 정의해야 정상 작동함
 예시: 
@@ -13,6 +16,19 @@ datasource = {
 }
 '''
 
+FETCH_SIZE = 10000  # fetchmany로 한 번에 가져올 행 수
+WRITE_BUFFER_SIZE = 1024 * 1024  # 출력 파일 버퍼 크기 (바이트)
+
+# 출력 파일 목록: 결과셋을 한 번 읽으면서 모든 파일에 같이 씀
+# - format: list("값" 목록), hashmap(Java HashMap 코드), csv, jsonl, columnar(열 단위 묶음, JSON Lines)
+# - columns: 쓸 열 이름 또는 위치(0부터), 생략하면 모든 열
+# - hashmap은 keys로 Map 키 지정 가능 (생략하면 열 이름), columnar는 row_group_size 지정 가능
+# 예: {'file': 'output.csv', 'format': 'csv', 'columns': ['phoneNo', 'email']}
+SINKS = [
+    {'file': 'output1', 'format': 'list', 'columns': [1]},
+    {'file': 'output2', 'format': 'hashmap', 'columns': [0, 1], 'keys': ['no', 'name']},
+]
+
 # SQL 쿼리를 파일에서 읽어옵니다.
 with open('query.sql', 'r') as file:
     query = file.read()
@@ -21,41 +37,34 @@ with open('query.sql', 'r') as file:
 conn = mysql.connector.connect(**datasource)
 
 # 커서 객체 생성
-cursor = conn.cursor()
+# buffered=False: 결과셋 전체를 클라이언트 메모리에 올리지 않고 서버에서 받는 대로 읽음
+cursor = conn.cursor(buffered=False)
 # SQL 쿼리 실행
 cursor.execute(query)
-# 결과셋
-rows = cursor.fetchall();
-
-# 대충 출력하기
-def printNormal(rows):
-    rst = ''
-    for row in rows:
-        # rst += str(row[0]) 
-        # rst += ', ' 
-        rst += '"' + str(row[1]) + '",'
-        rst += '\n'
-    rst = rst[:-2] # 마지막 문자 두 개 지우기
-    return rst
-
-# Java Map으로
-def printMap(rows):
-    rst = ''
-    for row in rows:
-        rst += 'map = new HashMap<>();'
-        rst += 'map.put("no", "' + str(row[0]) + '");'
-        rst += 'map.put("name", "' + str(row[1]) + '");'
-        rst += 'list.add(map);'
-        rst += '\n'
-    return rst
-
-# 결과를 파일에 쓰기
-with open('output1', 'w', encoding='UTF-8') as file:
-    file.write(printNormal(rows))
-
-# 결과를 파일에 쓰기
-with open('output2', 'w', encoding='UTF-8') as file:
-    file.write(printMap(rows))
+
+# 결과셋을 FETCH_SIZE 행씩 읽기 (행 수와 관계없이 메모리 일정)
+def iterRows(cursor, size=FETCH_SIZE):
+    while True:
+        rows = cursor.fetchmany(size)
+        if not rows:
+            return
+        yield from rows
+
+# 결과를 파일에 쓰기 (한 번 읽으면서 모든 출력 파일에 같이 씀)
+columnNames = [column[0] for column in cursor.description]
+with ExitStack() as stack:
+    sinks = []
+    for config in SINKS:
+        options = {key: value for key, value in config.items() if key not in ('file', 'format', 'columns')}
+        file = stack.enter_context(open(config['file'], 'w', encoding='UTF-8', buffering=WRITE_BUFFER_SIZE))
+        sinks.append(Sink(file, config['format'], columnNames, config.get('columns'), **options))
+
+    for row in iterRows(cursor):
+        for sink in sinks:
+            sink.write(row)
+
+    for sink in sinks:
+        sink.close()
 
 # 커서와 연결 종료
 cursor.close()
@@ -0,0 +1,119 @@
+"""
+다운로드 캐시: URL별 ETag/Last-Modified로 조건부 요청 + 내용 해시(sha256)로 중복 제거
+
+cache_dir/
+    index.json          URL -> {etag, last_modified, sha256, size}
+    blobs/<sha256>      내용이 같은 이미지는 blob 하나만 저장
+    partial/<url 해시>  받는 중인 파일 (끊기면 다음 실행에서 이어받음)
+
+- 저장된 ETag/Last-Modified가 있으면 If-None-Match/If-Modified-Since를 보내고,
+  304 Not Modified면 본문 없이 기존 blob을 사용한다
+- 출력 파일은 blob의 하드링크 (하드링크를 만들 수 없는 파일 시스템이면 복사)
+  하드링크이므로 출력 파일을 직접 수정하면 캐시의 blob도 바뀐다
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+
+URL_LOCK_STRIPES = 256  # URL 잠금 수 (URL 수와 관계없이 고정)
+
+
+class DownloadCache:
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, 'blobs')
+        self.partial_dir = os.path.join(cache_dir, 'partial')
+        self.index_path = os.path.join(cache_dir, 'index.json')
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._url_locks = [threading.Lock() for _ in range(URL_LOCK_STRIPES)]
+        self._dirty = False
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+
+    def blob_path(self, digest):
+        return os.path.join(self.blob_dir, digest)
+
+    def url_lock(self, url):
+        """
+        같은 URL을 여러 작업이 동시에 받지 않도록 (임시 파일을 같이 쓰므로)
+        URL마다 잠금을 만들지 않고 해시로 고정된 잠금 중 하나를 고름 (다른 URL이 가끔 같은 잠금을 기다릴 수 있음)
+        """
+        return self._url_locks[hash(url) % URL_LOCK_STRIPES]
+
+    def partial_path(self, url):
+        """url을 받는 동안 쓸 임시 파일 경로"""
+        return os.path.join(self.partial_dir, hashlib.sha1(url.encode('utf-8')).hexdigest())
+
+    def conditional_headers(self, url):
+        """캐시에 blob이 남아 있는 URL이면 조건부 요청 헤더 반환"""
+        with self._lock:
+            entry = self.index.get(url)
+        if not entry or not os.path.exists(self.blob_path(entry['sha256'])):
+            return {}
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def cached_blob(self, url):
+        """304 응답을 받은 URL의 blob 경로"""
+        with self._lock:
+            return self.blob_path(self.index[url]['sha256'])
+
+    def store(self, url, response, path, buffer_size=1024 * 1024):
+        """
+        다 받은 파일(path)을 blob으로 옮기고 blob 경로 반환
+        같은 내용의 blob이 이미 있으면 path는 지움
+        """
+        sha256 = hashlib.sha256()
+        size = 0
+        with open(path, 'rb') as f:
+            while chunk := f.read(buffer_size):
+                sha256.update(chunk)
+                size += len(chunk)
+        digest = sha256.hexdigest()
+        blob = self.blob_path(digest)
+        if os.path.exists(blob):
+            os.remove(path)
+        else:
+            os.replace(path, blob)
+
+        with self._lock:
+            self.index[url] = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'sha256': digest,
+                'size': size,
+            }
+            self._dirty = True
+        return blob
+
+    @staticmethod
+    def link(blob, destination):
+        """destination을 blob의 하드링크로 교체 (이미 같은 파일이면 그대로)"""
+        if os.path.exists(destination) and os.path.samefile(blob, destination):
+            return
+        tmp_path = f'{destination}.tmp-{threading.get_ident()}'
+        try:
+            os.link(blob, tmp_path)
+        except OSError:
+            shutil.copyfile(blob, tmp_path)
+        os.replace(tmp_path, destination)
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self.index, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.index_path)
+            self._dirty = False
@@ -1,45 +1,211 @@
+import argparse
+import json
 import os
-import requests  # request img from web
-import shutil  # save img locally
-from target_list import download_target_list
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple
+from download_cache import DownloadCache
+from partial_download import PartialDownload
+from progress import Progress
+from session_pool import SessionPool  # request img from web (호스트별 keep-alive 연결 재사용)
+from target_reader import FORMATS, detect_format, read_targets
 
 dependsOnUrl = False # True
 extension = ''
-download_target_list
+maxConnectionsPerHost = 4  # 호스트 하나에 동시에 열어 둘 최대 연결 수
+bufferSize = 1024 * 1024  # 읽기/쓰기 버퍼 크기 (바이트)
 
 parentDir = './output/'
-if not os.path.isdir(parentDir):
-    os.mkdir(parentDir)
+cacheDir = os.path.join(parentDir, '.cache')  # ETag/Last-Modified와 내용 해시별 blob 저장
+planFileName = 'plan.jsonl'  # 한 줄에 {"url": ..., "destination": ...} 하나
 
-preview_content = ''
-for target in download_target_list:
-    url = target['url']
-    if dependsOnUrl:
-        extension = url[url.rfind('.'):]
-    
-    fileName = target['name'] + extension
-    fileLocation = os.path.join(parentDir, fileName)
-    preview_content += f"url = {url}\n"
-    preview_content += f"fileLocation = {fileLocation}\n\n"
-
-preview_path = os.path.join(parentDir, 'preview.txt')
-with open(preview_path, 'w', encoding='utf-8') as f:
-    f.write(preview_content)
-
-for target in download_target_list:
+
+class PlanItem(NamedTuple):
+    """대상 하나를 해석한 결과: 받을 주소와 저장 경로"""
+    url: str
+    destination: str
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='target_list.py(또는 --targets 파일)의 이미지를 parentDir에 다운로드')
+    parser.add_argument('--targets', help='target_list.py 대신 이 CSV/JSONL 파일에서 대상을 읽음, -이면 표준 입력')
+    parser.add_argument('--targets-format', choices=FORMATS,
+                        help='--targets 형식 (기본: 확장자로 판단, 표준 입력이면 지정 필요)')
+    parser.add_argument('--jobs', type=int, default=8, help='동시에 다운로드할 파일 수 (기본 8)')
+    parser.add_argument('--per-host', type=int, default=maxConnectionsPerHost,
+                        help=f'호스트 하나에 동시에 열 최대 연결 수 (기본 {maxConnectionsPerHost})')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='캐시(조건부 요청, 중복 제거)를 쓰지 않고 매번 새로 받아 덮어씀')
+    parser.add_argument('--buffer-size', type=int, default=bufferSize // 1024,
+                        help=f'읽기/쓰기 버퍼 크기(KB, 기본 {bufferSize // 1024})')
+    plan_group = parser.add_mutually_exclusive_group()
+    plan_group.add_argument('--plan-only', action='store_true',
+                            help=f'다운로드하지 않고 preview.txt와 {planFileName}만 작성')
+    plan_group.add_argument('--plan', help=f'target_list.py 대신 이 계획 파일({planFileName} 형식)대로 다운로드')
+    args = parser.parse_args()
+    if args.jobs < 1 or args.per_host < 1 or args.buffer_size < 1:
+        parser.error('--jobs, --per-host, --buffer-size는 1 이상이어야 합니다')
+    if args.targets and not (args.targets_format or detect_format(args.targets)):
+        parser.error('--targets 형식을 알 수 없습니다, --targets-format csv|jsonl을 지정하세요')
+    return args
+
+
+def file_location(target):
+    """저장 경로: parentDir + name (+ dependsOnUrl이면 url의 확장자)"""
     url = target['url']
-    if (dependsOnUrl):
-        extension = url[url.rfind('.'): len(url)]
-    fileName = target['name'] + extension
-    destination = parentDir + fileName
-    
+    fileName = target['name'] + (url[url.rfind('.'):] if dependsOnUrl else extension)
+    return os.path.join(parentDir, fileName)
+
+
+def read_chunks(res, progress, buffer_size):
+    while chunk := res.raw.read(buffer_size):
+        progress.add_bytes(len(chunk))
+        yield chunk
+
+
+def build_plan(targets, preview_path, plan_path):
+    """
+    대상마다 저장 경로를 한 번만 계산해 PlanItem을 하나씩 반환
+    preview.txt와 계획 파일(JSON Lines)은 한 줄씩 버퍼에 모아 쓴다
+    """
+    with open(preview_path, 'w', encoding='utf-8', buffering=bufferSize) as preview, \
+            open(plan_path, 'w', encoding='utf-8', buffering=bufferSize) as plan_file:
+        for target in targets:
+            item = PlanItem(target['url'], file_location(target))
+            preview.write(f"url = {item.url}\nfileLocation = {item.destination}\n\n")
+            plan_file.write(json.dumps(item._asdict(), ensure_ascii=False) + '\n')
+            yield item
+
+
+def read_plan(path, on_invalid=None):
+    """계획 파일(JSON Lines)에서 PlanItem을 하나씩 읽기, 잘못된 줄은 on_invalid를 호출하고 건너뜀"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                item = PlanItem(**json.loads(line))
+            except (ValueError, TypeError) as e:
+                message = f"{path}:{line_no}: url, destination이 있는 JSON이어야 합니다 ({e})"
+                if on_invalid is None:
+                    raise ValueError(message) from e
+                on_invalid(message)
+                continue
+            yield item
+
+
+def load_targets(args, on_invalid=None):
+    """
+    (대상 이터러블, 전체 수) 반환, 파일/표준 입력에서 스트리밍으로 읽으면 전체 수는 None
+    잘못된 줄은 on_invalid('경로:줄 번호: 이유')를 호출하고 건너뜀
+    """
+    if args.targets:
+        return read_targets(args.targets, args.targets_format, on_invalid), None
+    # 큰 작업은 --targets를 쓰도록 하고, target_list.py는 필요할 때만 import
+    from target_list import download_target_list
+    return download_target_list, len(download_target_list)
+
+
+def download(sessions, url, destination, progress, cache=None, buffer_size=bufferSize):
+    """
+    url을 destination에 저장하고 (성공 여부, 메시지) 반환
+
+    임시 파일(.part)에 다 받은 뒤에 destination으로 옮기므로 중간에 끊겨도 잘린 파일이 남지 않고,
+    다음 실행에서 받은 부분부터 Range 요청으로 이어받는다.
+    cache가 있으면 조건부 요청을 보내고, 받은 내용은 blob으로 저장한 뒤 destination에 링크
+    """
+    part = PartialDownload(cache.partial_path(url) if cache else destination + '.part')
+    # 이어받을 파일이 있으면 조건부 요청 대신 Range 요청
+    headers = part.range_headers() or (cache.conditional_headers(url) if cache else {})
     try:
-        with requests.get(url, stream=True) as res:
-            if res.status_code == 200:
-                with open(destination, 'wb') as f:
-                    shutil.copyfileobj(res.raw, f)
-                print(f"Image successfully Downloaded: {destination}")
+        with sessions.get(url).get(url, headers=headers, stream=True) as res:
+            if res.status_code == 304 and cache and not part.resumable:
+                cache.link(cache.cached_blob(url), destination)
+                return True, f"Image not modified (cached): {destination}"
+            elif res.status_code in (200, 206):
+                resumed_from = part.write(res, read_chunks(res, progress, buffer_size), buffer_size)
+                if cache:
+                    cache.link(cache.store(url, res, part.path, buffer_size), destination)
+                    part.discard()
+                else:
+                    part.complete(destination)
+                resumed = f" (resumed from {resumed_from} bytes)" if resumed_from else ""
+                return True, f"Image successfully Downloaded: {destination}{resumed}"
+            elif res.status_code == 416 and part.resumable:
+                # 받아 둔 크기가 서버 파일보다 큼: 처음부터 다시 받음
+                part.discard()
             else:
-                print(f"Image Couldn't be retrieved. url: {url}, status_code: {res.status_code}")
+                return False, f"Image Couldn't be retrieved. url: {url}, status_code: {res.status_code}"
     except Exception as e:
-        print(f"Error occurred while downloading {url}: {e}")
\ No newline at end of file
+        return False, f"Error occurred while downloading {url}: {e}"
+    return download(sessions, url, destination, progress, cache, buffer_size)
+
+
+def main():
+    args = parse_args()
+
+    if not os.path.isdir(parentDir):
+        os.mkdir(parentDir)
+
+    progress = None
+
+    def skip_invalid(message):
+        # 잘못된 대상 한 줄 때문에 작업 전체를 멈추지 않고 실패로 집계
+        if progress:
+            progress.finish_one(False, message)
+        else:
+            print(message, file=sys.stderr)
+
+    if args.plan:
+        plan, total = read_plan(args.plan, skip_invalid), None
+    else:
+        targets, total = load_targets(args, skip_invalid)
+        plan = build_plan(targets, os.path.join(parentDir, 'preview.txt'),
+                          os.path.join(parentDir, planFileName))
+    if args.plan_only:
+        try:
+            count = sum(1 for _ in plan)
+        except (OSError, ValueError) as e:
+            sys.exit(f"❌ {e}")
+        print(f"📝 {count}개 대상의 계획을 {parentDir}에 작성했습니다.")
+        return
+
+    progress = Progress(total)
+    cache = None if args.no_cache else DownloadCache(cacheDir)
+    # 대상을 한꺼번에 제출하지 않고 jobs x 2개까지만 대기시킴 (대상 수와 관계없이 메모리 일정)
+    pending = threading.BoundedSemaphore(args.jobs * 2)
+
+    def download_item(item):
+        if cache:
+            # 같은 URL이 여러 번 나오면 앞의 작업이 끝난 뒤 조건부 요청으로 캐시를 사용
+            with cache.url_lock(item.url):
+                ok, message = download(sessions, item.url, item.destination, progress, cache,
+                                       args.buffer_size * 1024)
+        else:
+            ok, message = download(sessions, item.url, item.destination, progress, cache,
+                                   args.buffer_size * 1024)
+        progress.finish_one(ok, message)
+
+    error = None
+    # 호스트별 연결 수는 SessionPool이 --per-host로 제한 (초과한 작업은 연결이 반납될 때까지 대기)
+    try:
+        with SessionPool(args.per_host) as sessions, ThreadPoolExecutor(max_workers=args.jobs) as executor:
+            for item in plan:
+                pending.acquire()
+                executor.submit(download_item, item).add_done_callback(lambda _: pending.release())
+    except (OSError, ValueError) as e:
+        # 대상/계획 파일을 더 읽을 수 없음: 이미 제출한 다운로드는 끝낸 뒤 요약과 함께 종료
+        error = e
+    finally:
+        progress.close()
+        if cache:
+            cache.save()
+
+    print(f"📊 {progress.summary()}")
+    if error:
+        sys.exit(f"❌ {error}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+"""
+임시 파일(.part)에 받고, 끊긴 다운로드는 HTTP Range 요청으로 이어받기
+
+- 받는 중인 파일은 path에, 서버가 준 검증값(강한 ETag 또는 Last-Modified)은 path + '.json'에 저장
+- 다음 실행에서 path가 남아 있으면 Range: bytes=<받은 크기>- 와 If-Range: <검증값>을 보낸다
+  서버 파일이 바뀌었으면 서버가 206 대신 200으로 전체를 보내므로 처음부터 다시 받는다
+- 검증값이 없는 응답은 이어받을 수 없으므로 매번 처음부터 받는다
+"""
+import json
+import os
+import re
+
+CONTENT_RANGE = re.compile(r'bytes (\d+)-\d+/(\d+|\*)')
+
+
+class RangeMismatchError(Exception):
+    """206 응답의 시작 위치가 받아 둔 크기와 다름"""
+
+
+class PartialDownload:
+
+    def __init__(self, path):
+        self.path = path
+        self.meta_path = path + '.json'
+        self.size = os.path.getsize(path) if os.path.exists(path) else 0
+        self.validator = None
+        if self.size and os.path.exists(self.meta_path):
+            with open(self.meta_path, 'r', encoding='utf-8') as f:
+                self.validator = json.load(f).get('validator')
+
+    @property
+    def resumable(self):
+        return self.size > 0 and self.validator is not None
+
+    def range_headers(self):
+        """이어받을 수 있으면 Range/If-Range 헤더, 아니면 빈 dict"""
+        if not self.resumable:
+            return {}
+        return {'Range': f'bytes={self.size}-', 'If-Range': self.validator}
+
+    @staticmethod
+    def _validator(headers):
+        etag = headers.get('ETag')
+        # 약한 ETag(W/...)는 If-Range에 쓸 수 없음
+        if etag and not etag.startswith('W/'):
+            return etag
+        return headers.get('Last-Modified')
+
+    def write(self, res, chunks, buffer_size):
+        """
+        200/206 응답 본문을 path에 기록, 이어받았으면 이어받은 위치(바이트) 반환
+        중간에 끊기면 받은 만큼은 path에 남아 다음에 이어받는다
+        """
+        resumed_from = 0
+        if res.status_code == 206:
+            match = CONTENT_RANGE.match(res.headers.get('Content-Range', ''))
+            if not match or int(match.group(1)) != self.size:
+                self.discard()
+                raise RangeMismatchError(f"unexpected Content-Range: {res.headers.get('Content-Range')}")
+            resumed_from = self.size
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        validator = self._validator(res.headers)
+        if validator:
+            with open(self.meta_path, 'w', encoding='utf-8') as f:
+                json.dump({'validator': validator}, f)
+        elif os.path.exists(self.meta_path):
+            os.remove(self.meta_path)
+
+        with open(self.path, 'ab' if resumed_from else 'wb', buffering=buffer_size) as f:
+            for chunk in chunks:
+                f.write(chunk)
+        return resumed_from
+
+    def complete(self, destination):
+        """다 받은 파일을 destination으로 원자적으로 이동"""
+        os.replace(self.path, destination)
+        self._remove_meta()
+
+    def discard(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+        self._remove_meta()
+        self.size = 0
+        self.validator = None
+
+    def _remove_meta(self):
+        if os.path.exists(self.meta_path):
+            os.remove(self.meta_path)
@@ -0,0 +1,86 @@
+"""
+다운로드 진행 표시: 한 줄 진행 막대(완료 수, 받은 용량, 초당 바이트) + 최종 요약
+
+여러 스레드에서 호출해도 되며, 막대는 최대 초당 5번만 다시 그린다.
+전체 수(total)를 모르면(대상을 스트리밍으로 읽을 때) 막대 없이 완료 수만 표시한다.
+"""
+import sys
+import threading
+import time
+
+BAR_WIDTH = 30
+
+
+def format_bytes(size):
+    if size < 1024:
+        return f'{size:.0f} B'
+    for unit in ('KB', 'MB', 'GB'):
+        size /= 1024
+        if size < 1024 or unit == 'GB':
+            return f'{size:.1f} {unit}'
+
+
+class Progress:
+
+    def __init__(self, total, stream=sys.stderr, redraw_interval=0.2):
+        self.total = total
+        self.stream = stream
+        self.redraw_interval = redraw_interval
+        self.done = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.bytes = 0
+        self.started = time.perf_counter()
+        self._last_draw = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def add_bytes(self, size):
+        with self._lock:
+            self.bytes += size
+            self._draw()
+
+    def finish_one(self, ok, message=None):
+        """파일 하나 완료, message가 있으면 진행 막대 위에 출력"""
+        with self._lock:
+            self.done += 1
+            if ok:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            if message:
+                self.stream.write('\r\033[K')
+                print(message, file=self.stream)
+            self._draw(force=self.done == self.total)
+
+    def close(self):
+        """마지막 상태를 그리고 줄바꿈"""
+        with self._lock:
+            self._draw(force=True)
+            self.stream.write('\n')
+            self.stream.flush()
+
+    def _draw(self, force=False):
+        now = time.perf_counter()
+        if not force and now - self._last_draw < self.redraw_interval:
+            return
+        self._last_draw = now
+        rate = self.bytes / (now - self.started) if now > self.started else 0
+        if self.total is None:
+            self.stream.write(f'\r{self.done}개 완료, {format_bytes(self.bytes)}, {format_bytes(rate)}/s')
+        else:
+            ratio = self.done / self.total if self.total else 1
+            filled = int(BAR_WIDTH * ratio)
+            self.stream.write(f'\r[{"#" * filled}{"." * (BAR_WIDTH - filled)}] {self.done}/{self.total} '
+                              f'({ratio:.1%}) {format_bytes(self.bytes)}, {format_bytes(rate)}/s')
+        self.stream.flush()
+
+    def summary(self):
+        elapsed = self.elapsed
+        rate = self.bytes / elapsed if elapsed > 0 else 0
+        files_per_sec = self.done / elapsed if elapsed > 0 else 0
+        return (f'성공 {self.succeeded}개, 실패 {self.failed}개, {format_bytes(self.bytes)}, '
+                f'{elapsed:.1f}초 ({format_bytes(rate)}/s, {files_per_sec:.1f} files/s)')
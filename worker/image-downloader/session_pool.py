@@ -0,0 +1,48 @@
+"""
+호스트별 requests.Session 풀
+
+같은 호스트(예: item.kakaocdn.net)로 가는 요청은 하나의 Session을 써서
+DNS 조회, TCP/TLS 연결을 다시 하지 않고 keep-alive 연결을 재사용한다.
+호스트마다 연결은 최대 max_connections_per_host개이며, 모두 사용 중이면 반납될 때까지 기다린다.
+"""
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class SessionPool:
+
+    def __init__(self, max_connections_per_host=4):
+        self.max_connections_per_host = max_connections_per_host
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        """url의 호스트(scheme://host:port)용 Session 반환, 처음이면 생성"""
+        parts = urlsplit(url)
+        key = f'{parts.scheme}://{parts.netloc}'.lower()
+        with self._lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                # pool_block=True: 연결 수를 max_connections_per_host로 제한 (초과 요청은 대기)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_connections_per_host,
+                                      pool_block=True)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[key] = session
+            return session
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,58 @@
+"""
+대상 목록을 CSV/JSONL 파일이나 표준 입력에서 한 줄씩 읽기 (전체를 메모리에 올리지 않음)
+
+- CSV: 첫 줄이 헤더이고 name, url 열이 있어야 함
+- JSONL: 한 줄에 {"name": ..., "url": ...} 하나
+- 형식은 확장자(.csv, .jsonl/.ndjson)로 정하고, 표준 입력('-')이나 다른 확장자는 fmt로 지정
+- 잘못된 줄(name/url 없음, JSON이 아님)은 on_invalid('경로:줄 번호: 이유')를 호출하고 건너뜀,
+  on_invalid가 없으면 ValueError
+"""
+import csv
+import json
+import sys
+from contextlib import nullcontext
+
+FORMATS = ('csv', 'jsonl')
+
+
+def detect_format(path):
+    lower = path.lower()
+    if lower.endswith('.csv'):
+        return 'csv'
+    if lower.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    return None
+
+
+def read_targets(path, fmt=None, on_invalid=None):
+    """path('-'이면 표준 입력)에서 {'name', 'url'} dict를 하나씩 반환"""
+    fmt = fmt or detect_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"대상 파일 형식을 알 수 없습니다: {path} (--targets-format csv|jsonl 지정)")
+
+    source = nullcontext(sys.stdin) if path == '-' else open(path, 'r', encoding='utf-8', newline='')
+    with source as f:
+        if fmt == 'csv':
+            reader = csv.DictReader(f)
+            records = ((reader.line_num, row) for row in reader)
+        else:
+            records = ((line_no, line) for line_no, line in enumerate(f, start=1) if line.strip())
+        for line_no, record in records:
+            try:
+                target = _target(record if fmt == 'csv' else json.loads(record))
+            except json.JSONDecodeError as e:
+                message = f"{path}:{line_no}: JSON이 아닙니다 ({e})"
+            except ValueError as e:
+                message = f"{path}:{line_no}: {e}"
+            else:
+                yield target
+                continue
+            if on_invalid is None:
+                raise ValueError(message)
+            on_invalid(message)
+
+
+def _target(record):
+    if not isinstance(record, dict) or not record.get('name') or not record.get('url'):
+        raise ValueError("name, url이 모두 있어야 합니다")
+    return {'name': record['name'], 'url': record['url']}
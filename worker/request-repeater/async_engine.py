@@ -0,0 +1,82 @@
+"""
+asyncio 엔진: aiohttp 커넥션 풀(keep-alive)로 POST members/{id} 요청
+
+스레드 엔진은 요청마다 requests.post로 새 TCP 연결을 맺지만, 이 엔진은
+하나의 ClientSession에서 최대 concurrency개의 연결을 재사용한다.
+"""
+import asyncio
+import json
+
+import aiohttp
+
+
+async def post_member(session, host, member_id, controller, on_response, on_error):
+    url = f'{host}members/{member_id}'
+    retry_policy = controller.retry_policy
+    headers = retry_policy.headers()
+    started = await controller.start_async()
+    attempt = 1
+    try:
+        while True:
+            status_code = None
+            try:
+                async with session.post(url, headers=headers) as response:
+                    status_code = response.status
+                    text = await response.text()
+            except Exception as e:
+                if not retry_policy.should_retry(attempt, None):
+                    return on_error(member_id, e)
+            else:
+                if not retry_policy.should_retry(attempt, status_code):
+                    try:
+                        json_data = json.loads(text)
+                    except ValueError:
+                        json_data = {}
+                    return on_response(member_id, status_code, text, json_data)
+            started = await controller.retry_async(started, status_code, attempt)
+            attempt += 1
+    finally:
+        await controller.finish_async(started, status_code)
+
+
+async def run_async_engine(targets, host, controller, on_response, on_error, on_done=None):
+    """
+    controller.limiter.max_limit개의 워커 코루틴이 큐에서 회원 ID를 꺼내 요청한다.
+    실제 동시 요청 수와 초당 요청 수는 controller(토큰 버킷 + AIMD)가 정한다.
+
+    targets는 (줄 번호, 회원 ID)의 이터러블이면 되고 큐 크기만큼만 미리 읽으므로
+    대상 수와 관계없이 메모리 사용량이 일정하다. 요청이 끝나면 on_done(줄 번호, 성공 여부) 호출.
+
+    on_response(member_id, status, text, json_data), on_error(member_id, e)는
+    (성공 여부, 로그 메시지)를 반환해야 한다. (요청 수, 성공 건수)를 반환한다.
+    """
+    max_concurrency = controller.limiter.max_limit
+    queue = asyncio.Queue(maxsize=max_concurrency * 2)
+    total = 0
+    success_count = 0
+
+    async def worker(session):
+        nonlocal success_count
+        while True:
+            target = await queue.get()
+            if target is None:
+                return
+            line_no, member_id = target
+            ok, _ = await post_member(session, host, member_id, controller, on_response, on_error)
+            success_count += ok
+            if on_done:
+                on_done(line_no, ok)
+
+    connector = aiohttp.TCPConnector(limit=max_concurrency, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        workers = [asyncio.create_task(worker(session)) for _ in range(max_concurrency)]
+
+        for target in targets:
+            await queue.put(target)
+            total += 1
+
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+    return total, success_count
@@ -0,0 +1,72 @@
+"""
+재시작용 체크포인트: targets 파일의 줄 번호별 성공 여부를 비트맵으로 저장
+
+- 성공한 줄만 비트를 켜므로 재시작하면 성공한 ID는 건너뛰고 실패/미처리 ID만 다시 요청한다
+- flush_interval초마다 임시 파일에 쓴 뒤 교체하므로 도중에 죽어도 마지막 저장본은 온전하다
+- 줄 번호가 기준이므로 실행 사이에 targets 파일의 기존 줄을 고치면 안 된다 (끝에 추가는 괜찮음)
+
+파일 형식: 첫 줄은 JSON 헤더({"targets": 대상 파일 경로}), 나머지는 비트맵 (줄 번호 n -> n번째 비트)
+"""
+import json
+import os
+import threading
+import time
+
+
+class Checkpoint:
+
+    def __init__(self, path, targets_path, flush_interval=5.0):
+        self.path = path
+        self.targets_path = os.path.abspath(targets_path)
+        self.flush_interval = flush_interval
+        self.bitmap = bytearray()
+        self.skipped = 0
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            header = json.loads(f.readline())
+            if header.get('targets') != self.targets_path:
+                raise ValueError(f'{self.path}은(는) 다른 대상 파일({header.get("targets")})의 체크포인트입니다')
+            self.bitmap = bytearray(f.read())
+
+    def is_done(self, line_no):
+        """이전 실행에서 성공한 줄인지 (건너뛴 수를 함께 센다)"""
+        index, bit = divmod(line_no, 8)
+        done = index < len(self.bitmap) and bool(self.bitmap[index] & (1 << bit))
+        self.skipped += done
+        return done
+
+    def record(self, line_no, ok):
+        """요청 결과 반영, flush_interval이 지났으면 파일에 저장"""
+        if not ok:
+            return
+        with self._lock:
+            index, bit = divmod(line_no, 8)
+            if index >= len(self.bitmap):
+                self.bitmap.extend(bytes(index + 1 - len(self.bitmap)))
+            self.bitmap[index] |= 1 << bit
+            self._dirty = True
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._flush()
+
+    def flush(self):
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        """임시 파일에 쓰고 교체 (호출하는 쪽에서 lock을 잡고 있어야 함)"""
+        self._last_flush = time.monotonic()
+        if not self._dirty:
+            return
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(json.dumps({'targets': self.targets_path}).encode() + b'\n')
+            f.write(self.bitmap)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
@@ -0,0 +1,103 @@
+"""
+백그라운드 로그 기록: 요청 스레드/코루틴은 큐에 넣기만 하고, 파일 쓰기는 QueueListener 스레드가 한다
+
+- BatchFileHandler: 레코드마다 flush하지 않고 batch_size개 또는 flush_interval초마다 모아서 flush
+  (새 레코드가 없어도 QueueListener가 flush_interval초마다 깨어나 남은 레코드를 flush)
+- JsonLineFormatter: 한 줄에 JSON 하나 (extra={'fields': {...}}로 넘긴 값을 그대로 기록)
+
+사용:
+    listener = start_logging(success_logger, fail_logger, 'success.log', 'fail.log')
+    ...
+    listener.stop()
+"""
+import json
+import logging
+import logging.handlers
+import queue
+import time
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+class BatchFileHandler(logging.FileHandler):
+
+    def __init__(self, filename, batch_size=500, flush_interval=1.0, encoding='utf-8'):
+        super().__init__(filename, encoding=encoding)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        self._pending += 1
+        if self._pending >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self):
+        super().flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def flush_if_due(self):
+        """flush_interval이 지났는데 쓰지 않은 레코드가 남아 있으면 flush"""
+        if self._pending and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+
+class JsonLineFormatter(logging.Formatter):
+
+    def format(self, record):
+        data = {'time': self.formatTime(record), 'level': record.levelname}
+        data.update(getattr(record, 'fields', None) or {'message': record.getMessage()})
+        return json.dumps(data, ensure_ascii=False)
+
+
+class _ClosingQueueListener(logging.handlers.QueueListener):
+    """
+    큐가 flush_interval초 동안 비어 있으면 핸들러의 남은 레코드를 flush하고,
+    stop()에서 남은 레코드를 모두 쓴 뒤 파일까지 닫음
+    """
+
+    def __init__(self, log_queue, *handlers, flush_interval=1.0):
+        super().__init__(log_queue, *handlers)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block):
+        while True:
+            try:
+                return self.queue.get(block, timeout=self.flush_interval)
+            except queue.Empty:
+                for handler in self.handlers:
+                    handler.flush_if_due()
+
+    def stop(self):
+        super().stop()
+        for handler in self.handlers:
+            handler.close()
+
+
+def start_logging(success_logger, fail_logger, success_path, fail_path, json_lines=False,
+                  batch_size=500, flush_interval=1.0):
+    """두 로거를 큐에 연결하고 파일에 쓰는 QueueListener를 시작해 반환 (끝나면 stop() 호출)"""
+    formatter = JsonLineFormatter() if json_lines else logging.Formatter(TEXT_FORMAT)
+    log_queue = queue.SimpleQueue()
+    handlers = []
+    for logger, path in ((success_logger, success_path), (fail_logger, fail_path)):
+        handler = BatchFileHandler(path, batch_size, flush_interval)
+        handler.setFormatter(formatter)
+        # 큐는 하나이므로 로거 이름으로 파일을 나눔
+        handler.addFilter(logging.Filter(logger.name))
+        handlers.append(handler)
+
+        logger.handlers.clear()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        logger.propagate = False
+
+    listener = _ClosingQueueListener(log_queue, *handlers, flush_interval=flush_interval)
+    listener.start()
+    return listener
@@ -1,58 +1,282 @@
+import argparse
+import json
+import random
 import requests
+import threading
 import time
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor
+from checkpoint import Checkpoint
+from log_writer import start_logging
+from metrics import Metrics
+from rate_control import AimdLimiter, RateController, TokenBucket
+from retry import DEFAULT_RETRY_STATUSES, RetryPolicy
 
 host = 'http://localhost:7080/'
+body_limit = 0        # 로그에 남길 응답 본문 최대 길이 (0이면 전체)
+success_sample = 1.0  # success 로그에 남길 성공 응답의 비율
 
-# 성공 로거 설정
+# 성공/실패 로거 (파일 기록은 main()에서 start_logging으로 백그라운드 스레드에 연결)
 success_logger = logging.getLogger('success_logger')
-success_handler = logging.FileHandler('success.log', encoding='utf-8')
-success_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-success_logger.addHandler(success_handler)
 success_logger.setLevel(logging.INFO)
 
-# 실패 로거 설정
 fail_logger = logging.getLogger('fail_logger')
-fail_handler = logging.FileHandler('fail.log', encoding='utf-8')
-fail_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
-fail_logger.addHandler(fail_handler)
 fail_logger.setLevel(logging.ERROR)
 
-def post_member(member_id):
+
+def is_success(status_code, json_data):
+    """2xx 이면서 응답 본문의 success가 true면 성공"""
+    return 200 <= status_code < 300 and isinstance(json_data, dict) and json_data.get("success") is True
+
+
+def log_result(member_id, status_code, text, json_data):
+    """
+    응답 결과를 success.log/fail.log에 기록하고 (성공 여부, 로그 메시지) 반환
+    본문은 body_limit 길이까지만, 성공 응답은 success_sample 비율만 기록
+    """
+    if body_limit and len(text) > body_limit:
+        text = text[:body_limit] + '...'
+    log_message = f'memberId: {member_id}, 응답 상태 코드: {status_code}, 응답 본문: {text}'
+    fields = {'member_id': member_id, 'status': status_code, 'body': text}
+
+    if is_success(status_code, json_data):
+        if success_sample >= 1 or random.random() < success_sample:
+            success_logger.info(log_message, extra={'fields': fields})
+        return True, log_message
+    else:
+        fail_logger.error(log_message, extra={'fields': fields})
+        return False, log_message
+
+
+def log_error(member_id, e):
+    """요청 중 예외를 fail.log에 기록하고 (False, 로그 메시지) 반환"""
+    error_message = f'memberId: {member_id}, 요청 중 오류 발생: {e}'
+    fail_logger.error(error_message, extra={'fields': {'member_id': member_id, 'error': str(e)}})
+    return False, error_message
+
+
+def post_member(member_id, controller):
     url = f'{host}members/{member_id}'
     print(f'POST 요청: {url}')
+    retry_policy = controller.retry_policy
+    headers = retry_policy.headers()
+    started = time.perf_counter()
+    attempt = 1
     try:
-        response = requests.post(url)
+        while True:
+            status_code = None
+            try:
+                response = requests.post(url, headers=headers)
+                status_code = response.status_code
+            except Exception as e:
+                if not retry_policy.should_retry(attempt, None):
+                    return log_error(member_id, e)
+            else:
+                if not retry_policy.should_retry(attempt, status_code):
+                    try:
+                        json_data = response.json()
+                    except Exception:
+                        json_data = {}
+
+                    return log_result(member_id, response.status_code, response.text, json_data)
+            started = controller.retry(started, status_code, attempt)
+            attempt += 1
+    finally:
+        controller.finish(started, status_code)
+
+
+def read_targets(path, skip=None):
+    """
+    파일에서 (줄 번호, 회원 ID)를 한 줄씩 읽어 반환 (파일 전체를 메모리에 올리지 않음)
+    skip(줄 번호)이 True인 줄은 건너뜀
+    """
+    with open(path, 'r') as f:
+        for line_no, line in enumerate(f):
+            member_id = line.strip()
+            if member_id and not (skip and skip(line_no)):
+                yield line_no, member_id
+
+
+def run_thread_engine(targets, controller, on_done=None):
+    """
+    기존 방식: 스레드 풀 + 요청마다 새 연결 (requests.post)
+
+    Future를 모아두지 않고 완료 콜백에서 바로 결과를 처리하며, 동시 요청 수는
+    controller가 제한하므로 대상 수와 관계없이 메모리 사용량이 일정하다.
+    targets는 (줄 번호, 회원 ID), 요청이 끝나면 on_done(줄 번호, 성공 여부) 호출.
+    (요청 수, 성공 건수) 반환
+    """
+    total = 0
+    success_count = 0
+    lock = threading.Lock()
+
+    def handle_result(line_no, future):
+        nonlocal success_count
+        ok, message = future.result()
+        with lock:
+            success_count += ok
+        if on_done:
+            on_done(line_no, ok)
+        print(message)
+
+    with ThreadPoolExecutor(max_workers=controller.limiter.max_limit) as executor:
+        for line_no, member_id in targets:
+            # 토큰과 동시성 한도가 생길 때까지 대기
+            controller.start()
+            future = executor.submit(post_member, member_id, controller)
+            future.add_done_callback(lambda f, line_no=line_no: handle_result(line_no, f))
+            total += 1
+
+    return total, success_count
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='targets 파일의 회원 ID마다 POST members/{id} 요청')
+    parser.add_argument('--targets', default='./targets', help='대상 회원 ID 파일 (한 줄에 하나)')
+    parser.add_argument('--host', default=host, help=f'요청 대상 호스트 (기본 {host})')
+    parser.add_argument('--engine', choices=['thread', 'async'], default='thread',
+                        help='thread: 기존 스레드 풀, async: asyncio + keep-alive 커넥션 풀 (aiohttp 필요)')
+    parser.add_argument('--concurrency', type=int, default=10, help='동시 요청 수 (--adaptive면 시작값, 기본 10)')
+    parser.add_argument('--rate', type=float, default=5,
+                        help='초당 요청 수 목표, 0이면 제한 없음 (기본 5 = 0.2초 간격)')
+    parser.add_argument('--burst', type=int, default=1, help='토큰 버킷 크기: 한 번에 몰아서 보낼 수 있는 요청 수 (기본 1)')
+    parser.add_argument('--adaptive', action='store_true',
+                        help='지연/429/5xx에 따라 동시 요청 수를 AIMD로 자동 조절')
+    parser.add_argument('--min-concurrency', type=int, default=1, help='--adaptive 최소 동시 요청 수 (기본 1)')
+    parser.add_argument('--max-concurrency', type=int, help='--adaptive 최대 동시 요청 수 (기본 concurrency x 4)')
+    parser.add_argument('--latency-target', type=float,
+                        help='--adaptive 목표 지연(ms), 넘으면 동시 요청 수를 줄임')
+    parser.add_argument('--retries', type=int, default=0,
+                        help='요청 오류/재시도 대상 응답일 때 최대 재시도 횟수 (기본 0 = 재시도 안 함)')
+    parser.add_argument('--retry-statuses', default=','.join(map(str, DEFAULT_RETRY_STATUSES)),
+                        help='재시도할 응답 코드, 쉼표로 구분 (기본 429,502,503,504)')
+    parser.add_argument('--retry-base-delay', type=float, default=200,
+                        help='첫 재시도 백오프 상한(ms), 재시도마다 두 배 (기본 200)')
+    parser.add_argument('--retry-max-delay', type=float, default=10000, help='백오프 최대값(ms, 기본 10000)')
+    parser.add_argument('--retry-budget', type=float, default=0.1,
+                        help='실행 전체 재시도 수 한도: 요청 수 대비 비율 + 10 (기본 0.1)')
+    parser.add_argument('--idempotency-header', default='Idempotency-Key',
+                        help='재시도해도 같은 값을 보내는 멱등성 키 헤더 이름, 빈 값이면 보내지 않음 (기본 Idempotency-Key)')
+    parser.add_argument('--checkpoint', help='체크포인트 파일: 성공한 줄을 기록하고, 다시 실행하면 성공한 ID는 건너뜀')
+    parser.add_argument('--checkpoint-interval', type=float, default=5,
+                        help='체크포인트 저장 간격(초, 기본 5)')
+    parser.add_argument('--stats-interval', type=float, default=5,
+                        help='진행 현황(req/s, 오류율, 지연) 출력 간격(초), 0이면 출력 안 함 (기본 5)')
+    parser.add_argument('--report', help='실행이 끝나면 처리량/지연 분위수를 이 경로에 JSON으로 저장')
+    parser.add_argument('--log-format', choices=['text', 'jsonl'], default='text',
+                        help='text: success.log/fail.log (기본), jsonl: success.jsonl/fail.jsonl에 한 줄에 JSON 하나')
+    parser.add_argument('--log-body-limit', type=int, default=0,
+                        help='로그에 남길 응답 본문 최대 길이, 0이면 전체 (기본 0)')
+    parser.add_argument('--log-success-sample', type=float, default=1.0,
+                        help='성공 응답 중 로그에 남길 비율 0~1, 실패는 항상 기록 (기본 1)')
+    args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error('--concurrency는 1 이상이어야 합니다')
+    try:
+        args.retry_statuses = [int(code) for code in args.retry_statuses.split(',') if code.strip()]
+    except ValueError:
+        parser.error('--retry-statuses는 쉼표로 구분한 응답 코드여야 합니다')
+    return args
+
+
+def build_controller(args, metrics=None):
+    """옵션에 맞는 속도 제어기 생성 (--adaptive가 아니면 동시 요청 수 고정)"""
+    bucket = TokenBucket(args.rate, args.burst)
+    if args.adaptive:
+        limiter = AimdLimiter(
+            args.concurrency,
+            min_limit=args.min_concurrency,
+            max_limit=args.max_concurrency or args.concurrency * 4,
+            latency_target=args.latency_target / 1000 if args.latency_target else None
+        )
+    else:
+        limiter = AimdLimiter(args.concurrency, min_limit=args.concurrency, max_limit=args.concurrency)
+    retry_policy = RetryPolicy(
+        args.retries,
+        retry_statuses=args.retry_statuses,
+        base_delay=args.retry_base_delay / 1000,
+        max_delay=args.retry_max_delay / 1000,
+        budget_ratio=args.retry_budget,
+        idempotency_header=args.idempotency_header
+    )
+    return RateController(bucket, limiter, metrics, retry_policy)
+
+
+def write_report(path, args, controller, metrics, total, success_count, skipped, elapsed):
+    """최종 결과를 JSON으로 저장"""
+    limiter = controller.limiter
+    report = {
+        'engine': args.engine,
+        'host': host,
+        'targets': args.targets,
+        'total': total,
+        'success': success_count,
+        'failed': total - success_count,
+        'skipped': skipped,
+        'elapsed_sec': round(elapsed, 3),
+        'requests_per_sec': round(total / elapsed, 1) if elapsed > 0 else None,
+        'target_rate': args.rate or None,
+        'concurrency': {'final': round(limiter.limit, 1), 'min': limiter.min_limit,
+                        'max': limiter.max_limit, 'decreases': limiter.decrease_count},
+        'retries': {'count': controller.retry_policy.retries,
+                    'budget_exhausted': controller.retry_policy.budget_exhausted},
+    }
+    report.update(metrics.report())
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    global host, body_limit, success_sample
+    args = parse_args()
+    host = args.host if args.host.endswith('/') else args.host + '/'
+    body_limit = args.log_body_limit
+    success_sample = args.log_success_sample
+
+    checkpoint = None
+    if args.checkpoint:
         try:
-            json_data = response.json()
-        except Exception:
-            json_data = {}
-
-        log_message = f'memberId: {member_id}, 응답 상태 코드: {response.status_code}, 응답 본문: {response.text}'
-        
-        if 200 <= response.status_code < 300 and json_data.get("success") is True:
-            success_logger.info(log_message)
+            checkpoint = Checkpoint(args.checkpoint, args.targets, args.checkpoint_interval)
+        except ValueError as e:
+            raise SystemExit(str(e))
+
+    targets = read_targets(args.targets, skip=checkpoint.is_done if checkpoint else None)
+    on_done = checkpoint.record if checkpoint else None
+    metrics = Metrics(args.stats_interval)
+    controller = build_controller(args, metrics)
+    extension = 'jsonl' if args.log_format == 'jsonl' else 'log'
+    log_listener = start_logging(success_logger, fail_logger, f'success.{extension}', f'fail.{extension}',
+                                 json_lines=args.log_format == 'jsonl')
+
+    start = time.perf_counter()
+    metrics.start()
+    try:
+        if args.engine == 'async':
+            import asyncio
+            from async_engine import run_async_engine
+            total, success_count = asyncio.run(
+                run_async_engine(targets, host, controller, log_result, log_error, on_done))
         else:
-            fail_logger.error(log_message)
-        
-        return log_message
-    except Exception as e:
-        error_message = f'memberId: {member_id}, 요청 중 오류 발생: {e}'
-        fail_logger.error(error_message)
-        return error_message
-
-# 파일에서 대상 목록 읽기
-with open('./targets', 'r') as f:
-    member_ids = [line.strip() for line in f if line.strip()]
-
-futures = []
-
-with ThreadPoolExecutor(max_workers=10) as executor:
-    for member_id in member_ids:
-        future = executor.submit(post_member, member_id)
-        futures.append(future)
-        time.sleep(0.2)  # 초 단위 간격
-
-    for future in as_completed(futures):
-        print(future.result())
+            total, success_count = run_thread_engine(targets, controller, on_done)
+    finally:
+        metrics.stop()
+        # 큐에 남은 로그를 모두 쓰고 파일 닫기
+        log_listener.stop()
+        # 중단되더라도 그때까지의 진행 상황은 저장
+        if checkpoint:
+            checkpoint.flush()
+    elapsed = time.perf_counter() - start
+
+    # 엔진 비교용 요약
+    throughput = total / elapsed if elapsed > 0 else 0
+    skipped = f', 이전 실행에서 성공해 건너뜀 {checkpoint.skipped}건' if checkpoint else ''
+    print(f'[{args.engine}] 요청 {total}건 (성공 {success_count}, 실패 {total - success_count}{skipped}), '
+          f'{elapsed:.2f}초, {throughput:.1f} req/s, 목표 {args.rate or "제한 없음"} req/s, {controller.summary()}')
+    print(f'[{args.engine}] 지연 {metrics.summary_line()}')
+    if args.report:
+        write_report(args.report, args, controller, metrics, total, success_count,
+                     checkpoint.skipped if checkpoint else 0, elapsed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,139 @@
+"""
+부하 측정: 요청별 지연 히스토그램 + 주기적인 처리량/오류율 출력
+
+- LatencyHistogram: HDR 히스토그램처럼 값의 크기에 따라 버킷 폭이 넓어지는 로그-선형 버킷
+  (상대 오차 약 1.5%, 1µs ~ 수 시간). 요청 수와 관계없이 메모리는 버킷 수만큼만 쓴다
+- Metrics: 응답 코드별 건수와 지연을 모으고, interval초마다 현재 req/s, 오류율, 지연 분위수를 출력
+"""
+import threading
+import time
+
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_HALF = 1 << (SUB_BUCKET_BITS - 1)
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    """지연(초)을 µs 단위 로그-선형 버킷에 기록"""
+
+    def __init__(self):
+        self.counts = []
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @staticmethod
+    def _index(micros):
+        if micros < SUB_BUCKET_HALF * 2:
+            return micros
+        shift = micros.bit_length() - SUB_BUCKET_BITS
+        return shift * SUB_BUCKET_HALF + (micros >> shift)
+
+    @staticmethod
+    def _upper_bound(index):
+        """버킷에 들어가는 가장 큰 값(µs)"""
+        if index < SUB_BUCKET_HALF * 2:
+            return index
+        shift, sub = divmod(index - SUB_BUCKET_HALF, SUB_BUCKET_HALF)
+        return ((sub + SUB_BUCKET_HALF + 1) << shift) - 1
+
+    def record(self, seconds):
+        index = self._index(max(0, int(seconds * 1_000_000)))
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = seconds if self.max is None else max(self.max, seconds)
+
+    def percentile(self, p):
+        """p 분위수(초), 기록이 없으면 None"""
+        if not self.count:
+            return None
+        target = max(1, round(self.count * p / 100))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= target:
+                return min(self._upper_bound(index) / 1_000_000, self.max)
+        return self.max
+
+    def summary(self):
+        """분위수/최소/최대/평균 (ms)"""
+        def ms(seconds):
+            return None if seconds is None else round(seconds * 1000, 3)
+
+        result = {f'p{p:g}': ms(self.percentile(p)) for p in PERCENTILES}
+        result.update(min=ms(self.min), max=ms(self.max),
+                      mean=ms(self.total / self.count) if self.count else None)
+        return result
+
+
+class Metrics:
+    """응답 코드별 건수와 지연 기록 (스레드 안전), interval초마다 현황 출력"""
+
+    def __init__(self, interval=5.0):
+        self.interval = interval
+        self.histogram = LatencyHistogram()
+        self.status_counts = {}
+        self.errors = 0
+        self._lock = threading.Lock()
+        self._started = None
+        self._stop = threading.Event()
+        self._reporter = None
+
+    def record(self, latency, status_code):
+        """요청 하나 기록: 요청 오류(status_code None), 429, 5xx는 오류로 센다"""
+        key = 'error' if status_code is None else str(status_code)
+        with self._lock:
+            self.histogram.record(latency)
+            self.status_counts[key] = self.status_counts.get(key, 0) + 1
+            if status_code is None or status_code == 429 or status_code >= 500:
+                self.errors += 1
+
+    def start(self):
+        self._started = time.perf_counter()
+        if self.interval and self.interval > 0:
+            self._reporter = threading.Thread(target=self._report_loop, daemon=True)
+            self._reporter.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._reporter:
+            self._reporter.join()
+
+    def _report_loop(self):
+        last_count = 0
+        last_errors = 0
+        last_time = self._started
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            with self._lock:
+                count = self.histogram.count
+                errors = self.errors
+                latency = self.histogram.summary()
+            # req/s와 오류율은 이번 구간, 지연 분위수는 시작부터 누적
+            interval_count = count - last_count
+            rps = interval_count / (now - last_time)
+            error_rate = (errors - last_errors) / interval_count * 100 if interval_count else 0
+            print(f'[stats] {now - self._started:.0f}초 요청 {count}건, {rps:.1f} req/s, 오류율 {error_rate:.1f}%, '
+                  f'p50 {latency["p50"]}ms, p99 {latency["p99"]}ms')
+            last_count, last_errors, last_time = count, errors, now
+
+    def summary_line(self):
+        latency = self.histogram.summary()
+        return ' '.join(f'{name} {latency[name]}ms' for name in ('p50', 'p90', 'p99', 'p99.9', 'max'))
+
+    def report(self):
+        """최종 JSON 리포트용 dict"""
+        with self._lock:
+            count = self.histogram.count
+            return {
+                'requests': count,
+                'errors': self.errors,
+                'error_rate': round(self.errors / count, 4) if count else 0,
+                'status_counts': dict(sorted(self.status_counts.items())),
+                'latency_ms': self.histogram.summary(),
+            }
@@ -0,0 +1,183 @@
+"""
+요청 속도 제어: 토큰 버킷(목표 RPS) + AIMD 동시성 제한
+
+- TokenBucket: 초당 rate개의 토큰을 채우고, 요청마다 토큰 하나를 소비한다
+- AimdLimiter: 동시 요청 한도를 응답에 따라 조절한다
+  정상 응답이면 한도를 조금씩 늘리고(additive increase), 429/5xx/오류이거나
+  지연이 목표보다 길면 한도를 줄인다(multiplicative decrease)
+
+스레드 엔진은 acquire()/release(), asyncio 엔진은 acquire_async()/release_async()를 쓴다.
+"""
+import asyncio
+import threading
+import time
+
+from retry import RetryPolicy
+
+
+class TokenBucket:
+    """초당 rate개, 최대 burst개까지 쌓이는 토큰 버킷 (rate가 0 이하면 제한 없음)"""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        """토큰 하나를 예약하고, 사용할 수 있을 때까지 기다려야 하는 시간(초)을 반환"""
+        if self.rate <= 0:
+            return 0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # 토큰이 음수가 되면 그만큼 미래의 토큰을 미리 예약한 것
+            self._tokens -= 1
+            return 0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def acquire_async(self):
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+def is_overload(status_code, latency, latency_target):
+    """서버가 버거워한다는 신호: 요청 오류, 429, 5xx, 목표보다 긴 지연"""
+    if status_code is None or status_code == 429 or status_code >= 500:
+        return True
+    return latency_target is not None and latency > latency_target
+
+
+class AimdLimiter:
+    """AIMD 방식으로 동시 요청 한도를 조절 (min_limit == max_limit이면 고정 한도)"""
+
+    def __init__(self, initial, min_limit=1, max_limit=None, latency_target=None,
+                 backoff=0.7, cooldown=1.0):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit if max_limit is not None else initial)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.latency_target = latency_target
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self.decrease_count = 0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+        self._async_cond = None
+
+    def _has_room(self):
+        return self.in_flight < int(self.limit)
+
+    def _update(self, status_code, latency):
+        """응답 하나를 반영해 한도 조절"""
+        if is_overload(status_code, latency, self.latency_target):
+            now = time.monotonic()
+            # 같은 혼잡에 대한 연속 감소를 막기 위해 cooldown 동안은 한 번만 줄임
+            if now - self._last_decrease >= self.cooldown and self.limit > self.min_limit:
+                self.limit = max(self.min_limit, self.limit * self.backoff)
+                self._last_decrease = now
+                self.decrease_count += 1
+        else:
+            # 한도만큼의 응답이 모두 정상이면 한도가 1 늘어남
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def acquire(self):
+        with self._cond:
+            self._cond.wait_for(self._has_room)
+            self.in_flight += 1
+
+    def observe(self, status_code, latency):
+        """자리는 그대로 둔 채 응답 하나를 반영 (재시도 전 실패한 시도)"""
+        with self._cond:
+            self._update(status_code, latency)
+
+    def release(self, status_code, latency):
+        with self._cond:
+            self.in_flight -= 1
+            self._update(status_code, latency)
+            self._cond.notify_all()
+
+    async def acquire_async(self):
+        if self._async_cond is None:
+            self._async_cond = asyncio.Condition()
+        async with self._async_cond:
+            await self._async_cond.wait_for(self._has_room)
+            self.in_flight += 1
+
+    async def release_async(self, status_code, latency):
+        async with self._async_cond:
+            self.in_flight -= 1
+            self._update(status_code, latency)
+            self._async_cond.notify_all()
+
+
+class RateController:
+    """
+    토큰 버킷과 동시성 제한을 묶어 요청 하나의 시작/끝을 관리
+    metrics가 있으면 시도마다 metrics.record(지연, 응답 코드) 호출
+
+    재시도는 동시성 자리를 쥔 채로 백오프한 뒤 토큰을 새로 받아 보낸다.
+    자리를 내놓고 다시 기다리면 아직 실행되지 않은 요청이 자리를 먼저 차지해
+    스레드 엔진이 멈출 수 있고, 쥐고 있으면 재시도가 동시 요청 수를 늘리지도 않는다.
+    """
+
+    def __init__(self, bucket, limiter, metrics=None, retry_policy=None):
+        self.bucket = bucket
+        self.limiter = limiter
+        self.metrics = metrics
+        self.retry_policy = retry_policy or RetryPolicy()
+
+    def start(self):
+        # 자리를 먼저 잡고 토큰을 받음: 토큰을 먼저 받으면 자리를 기다리는 동안 토큰이 묵었다가
+        # 자리가 나는 순간 한꺼번에 나가 rate/burst를 넘는다
+        self.limiter.acquire()
+        self.bucket.acquire()
+        return time.perf_counter()
+
+    def finish(self, started, status_code):
+        latency = time.perf_counter() - started
+        self.limiter.release(status_code, latency)
+        if self.metrics:
+            self.metrics.record(latency, status_code)
+
+    def retry(self, started, status_code, attempt):
+        """실패한 attempt번째 시도를 반영하고 백오프 후 다음 시도 시작 시각 반환"""
+        self._observe(started, status_code)
+        time.sleep(self.retry_policy.backoff(attempt))
+        self.bucket.acquire()
+        return time.perf_counter()
+
+    def _observe(self, started, status_code):
+        latency = time.perf_counter() - started
+        self.limiter.observe(status_code, latency)
+        if self.metrics:
+            self.metrics.record(latency, status_code)
+
+    async def start_async(self):
+        await self.limiter.acquire_async()
+        await self.bucket.acquire_async()
+        return time.perf_counter()
+
+    async def finish_async(self, started, status_code):
+        latency = time.perf_counter() - started
+        await self.limiter.release_async(status_code, latency)
+        if self.metrics:
+            self.metrics.record(latency, status_code)
+
+    async def retry_async(self, started, status_code, attempt):
+        self._observe(started, status_code)
+        await asyncio.sleep(self.retry_policy.backoff(attempt))
+        await self.bucket.acquire_async()
+        return time.perf_counter()
+
+    def summary(self):
+        limiter = self.limiter
+        return (f'동시성 한도 {limiter.limit:.1f} (범위 {limiter.min_limit}~{limiter.max_limit}, '
+                f'감소 {limiter.decrease_count}회), {self.retry_policy.summary()}')
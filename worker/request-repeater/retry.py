@@ -0,0 +1,62 @@
+"""
+재시도 정책: 재시도할 응답 코드, 지터를 넣은 지수 백오프, 실행 전체의 재시도 예산, 멱등성 키
+
+- 요청 오류(연결 끊김 등)와 retry_statuses 응답만 재시도한다
+- 백오프는 full jitter: 0 ~ min(max_delay, base_delay * 2^(시도-1)) 사이 임의 값
+- 재시도 수는 첫 시도 수의 budget_ratio 배(+ budget_min)를 넘지 않는다
+  서버가 계속 실패할 때 재시도가 요청을 몇 배로 불리지 않도록 하기 위함
+- 같은 요청의 재시도에는 같은 멱등성 키 헤더를 보내 서버가 중복 처리를 걸러낼 수 있게 한다
+
+재시도는 RateController.retry()를 거치므로 토큰 버킷과 AIMD 동시성 제한을 그대로 따른다.
+"""
+import random
+import threading
+import uuid
+
+DEFAULT_RETRY_STATUSES = (429, 502, 503, 504)
+
+
+class RetryPolicy:
+
+    def __init__(self, max_retries=0, retry_statuses=DEFAULT_RETRY_STATUSES, base_delay=0.2, max_delay=10.0,
+                 budget_ratio=0.1, budget_min=10, idempotency_header='Idempotency-Key'):
+        self.max_retries = max(0, max_retries)
+        self.retry_statuses = frozenset(retry_statuses)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget_ratio = budget_ratio
+        self.budget_min = budget_min
+        self.idempotency_header = idempotency_header
+        self.requests = 0
+        self.retries = 0
+        self.budget_exhausted = 0
+        self._lock = threading.Lock()
+
+    def headers(self):
+        """요청 하나(재시도 포함)에 붙일 헤더"""
+        if not self.idempotency_header:
+            return {}
+        return {self.idempotency_header: str(uuid.uuid4())}
+
+    def is_retryable(self, status_code):
+        return status_code is None or status_code in self.retry_statuses
+
+    def should_retry(self, attempt, status_code):
+        """attempt번째 시도의 결과가 status_code일 때 재시도할지 (재시도하면 예산에서 하나 차감)"""
+        with self._lock:
+            if attempt == 1:
+                self.requests += 1
+            if attempt > self.max_retries or not self.is_retryable(status_code):
+                return False
+            if self.retries >= self.requests * self.budget_ratio + self.budget_min:
+                self.budget_exhausted += 1
+                return False
+            self.retries += 1
+            return True
+
+    def backoff(self, attempt):
+        """attempt번째 시도가 실패한 뒤 기다릴 시간(초)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+
+    def summary(self):
+        return f'재시도 {self.retries}회 (예산 초과로 포기 {self.budget_exhausted}건)'
@@ -1,71 +1,122 @@
 """
 Database connection and metadata fetching module
 """
+import json
+import os
 import re
+import sys
 import pymysql
+from pathlib import Path
 from typing import List, Dict, Any, Optional
 
 # Import database configuration
 from db import DB_TYPE, DB_CONFIG
+from type_resolver import get_type_resolver
+
+# Shared modules of the code generators (../common)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'common'))
+from db_pool import ConnectionPool
+
+# Connection pool shared by every DatabaseConnector in this process
+_connection_pool: Optional[ConnectionPool] = None
+
+# Default directory for on-disk schema snapshots
+SCHEMA_CACHE_DIR = '.schema_cache'
+
+
+class SchemaCache:
+    """On-disk snapshot of table schemas, one JSON file per host/database
+    
+    Stores the raw INFORMATION_SCHEMA rows of each table together with its
+    CREATE_TIME/UPDATE_TIME so the snapshot can be checked against the server.
+    """
+    
+    def __init__(self, config: Dict[str, Any], cache_dir: str = SCHEMA_CACHE_DIR):
+        key = f"{config['host']}_{config['port']}_{config['database']}"
+        safe_key = re.sub(r'[^\w.-]', '_', key)
+        self.path = Path(cache_dir) / f"{safe_key}.json"
+        self._tables = None
+        self._dirty = False
+    
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """Load snapshot file lazily (missing or broken file means empty cache)"""
+        if self._tables is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._tables = json.load(f).get('tables', {})
+            except (OSError, ValueError):
+                self._tables = {}
+        return self._tables
+    
+    def get(self, table_name: str) -> Optional[Dict[str, Any]]:
+        """Return cached schema of a table (case-insensitive) or None"""
+        return self._load().get(table_name.lower())
+    
+    def put(self, schema: Dict[str, Any]):
+        """Store schema of a table"""
+        self._load()[schema['table_name'].lower()] = schema
+        self._dirty = True
+    
+    def is_fresh(self, schema: Dict[str, Any], create_time, update_time) -> bool:
+        """Check cached schema against CREATE_TIME/UPDATE_TIME from the server"""
+        return (schema.get('create_time') == _to_str(create_time)
+                and schema.get('update_time') == _to_str(update_time))
+    
+    def save(self):
+        """Write snapshot file if anything changed"""
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix('.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'tables': self._tables}, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+
+def _to_str(value) -> Optional[str]:
+    """Normalize datetime values from INFORMATION_SCHEMA for JSON comparison"""
+    return str(value) if value is not None else None
+
+
+def glob_to_like(pattern: str) -> str:
+    """Convert a table name glob (e.g. 'app_*') to a SQL LIKE pattern"""
+    escaped = pattern.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return escaped.replace('*', '%').replace('?', '_')
 
 
 class DatabaseConnector:
     """Handle database connections and metadata fetching"""
     
-    def __init__(self):
-        # Note: type_mapping is used for simple DATA_TYPE matching
-        # For more precise matching, use get_java_type_from_column_type
-        self.type_mapping = {
-            # Numeric types
-            'int': 'java.lang.Integer',
-            'integer': 'java.lang.Integer',
-            'bigint': 'java.lang.Long',
-            'smallint': 'java.lang.Integer',
-            'tinyint': 'java.lang.Boolean',  # Changed to Boolean as per requirement
-            'mediumint': 'java.lang.Integer',
-            'decimal': 'java.math.BigDecimal',
-            'numeric': 'java.math.BigDecimal',
-            'float': 'java.lang.Float',
-            'double': 'java.lang.Double',
-            'real': 'java.lang.Float',
-            
-            # String types
-            'varchar': 'java.lang.String',
-            'char': 'java.lang.String',
-            'text': 'java.lang.String',
-            'longtext': 'java.lang.String',
-            'mediumtext': 'java.lang.String',
-            'tinytext': 'java.lang.String',
-            'enum': 'java.lang.String',
-            'set': 'java.lang.String',
-            
-            # Date/Time types
-            'date': 'java.time.LocalDate',
-            'datetime': 'java.time.LocalDateTime',
-            'timestamp': 'java.time.LocalDateTime',
-            'time': 'java.time.LocalTime',
-            
-            # Boolean
-            'boolean': 'java.lang.Boolean',
-            'bit': 'java.lang.Boolean',
-            'bool': 'java.lang.Boolean',
-            
-            # Binary
-            'blob': 'java.lang.String',  # Changed to String as per requirement
-            'tinyblob': 'java.lang.String',
-            'mediumblob': 'java.lang.String',
-            'longblob': 'java.lang.String',
-            'binary': 'java.lang.String',
-            'varbinary': 'java.lang.String',
-        }
+    def __init__(self, use_cache: bool = True, refresh: bool = False, trust_cache: bool = False,
+                 language: str = 'java'):
+        """
+        Args:
+            use_cache: If True, read/write table schemas from the on-disk snapshot
+            refresh: If True, ignore cached schemas and reload them from the server
+            trust_cache: If True, use a cached schema without comparing its
+                CREATE_TIME/UPDATE_TIME with the server (no query at all)
+            language: Target language of the type resolver
+        """
+        self.refresh = refresh
+        self.trust_cache = trust_cache
+        self.schema_cache = SchemaCache(self.get_config()) if use_cache else None
+        self._available_tables = None
+        self.type_resolver = get_type_resolver(language)
     
-    def get_connection(self):
-        """Get MariaDB connection"""
+    def get_config(self) -> Dict[str, Any]:
+        """Get MariaDB connection configuration"""
         config = DB_CONFIG.get(DB_TYPE)
         
         if not config:
             raise ValueError(f"Database configuration not found")
         
+        return config
+    
+    def get_connection(self):
+        """Get MariaDB connection"""
+        config = self.get_config()
+        
         try:
             connection = pymysql.connect(
                 host=config['host'],
@@ -83,6 +134,22 @@ class DatabaseConnector:
             print(f"❌ Failed to connect to database: {e}")
             raise
     
+    def acquire_connection(self):
+        """Get a connection from the shared pool (opened on demand)"""
+        global _connection_pool
+        if _connection_pool is None:
+            config = self.get_config()
+            _connection_pool = ConnectionPool(
+                self.get_connection,
+                max_size=config.get('pool_max_size', 4),
+                idle_timeout=config.get('pool_idle_timeout', 300)
+            )
+        return _connection_pool.acquire()
+    
+    def release_connection(self, conn):
+        """Return a connection to the shared pool"""
+        _connection_pool.release(conn)
+    
     def to_camel_case(self, snake_str: str, capitalize: bool = False) -> str:
         """Convert snake_case to camelCase or PascalCase"""
         components = snake_str.split('_')
@@ -92,82 +159,21 @@ class DatabaseConnector:
             return components[0] + ''.join(x.title() for x in components[1:])
     
     def get_java_type(self, db_type: str) -> str:
-        """Map database types to Java types"""
-        # Extract base type (remove size specification)
-        base_type = re.sub(r'\([^)]*\)', '', db_type.lower()).strip()
-        return self.type_mapping.get(base_type, 'java.lang.Object')
+        """Map database types (DATA_TYPE) to Java types"""
+        return self.type_resolver.resolve(db_type)
     
     def get_java_type_from_column_type(self, column_type: str) -> str:
-        """Map database column types to Java types using COLUMN_TYPE for more precision"""
-        column_type_lower = column_type.lower()
-        
-        # Check column types in order of specificity
-        if column_type_lower.startswith('tinyint'):
-            return 'java.lang.Boolean'
-        elif column_type_lower.startswith('smallint'):
-            return 'java.lang.Integer'
-        elif column_type_lower.startswith('mediumint'):
-            return 'java.lang.Integer'
-        elif column_type_lower.startswith('bigint'):
-            return 'java.lang.Long'
-        elif column_type_lower.startswith('int'):
-            return 'java.lang.Integer'
-        elif column_type_lower.startswith('float'):
-            return 'java.lang.Float'
-        elif column_type_lower.startswith('double'):
-            return 'java.lang.Double'
-        elif column_type_lower.startswith('decimal'):
-            return 'java.math.BigDecimal'
-        elif column_type_lower.startswith('numeric'):
-            return 'java.math.BigDecimal'
-        elif column_type_lower.startswith('varchar'):
-            return 'java.lang.String'
-        elif column_type_lower.startswith('char'):
-            return 'java.lang.String'
-        elif column_type_lower.startswith('datetime'):
-            return 'java.time.LocalDateTime'
-        elif column_type_lower.startswith('date'):
-            return 'java.time.LocalDate'
-        elif column_type_lower.startswith('time'):
-            return 'java.time.LocalTime'
-        elif column_type_lower.startswith('timestamp'):
-            return 'java.time.LocalDateTime'
-        elif column_type_lower.startswith('longtext'):
-            return 'java.lang.String'
-        elif column_type_lower.startswith('mediumtext'):
-            return 'java.lang.String'
-        elif column_type_lower.startswith('tinytext'):
-            return 'java.lang.String'
-        elif column_type_lower.startswith('text'):
-            return 'java.lang.String'
-        elif column_type_lower.startswith('longblob'):
-            return 'java.lang.String'
-        elif column_type_lower.startswith('mediumblob'):
-            return 'java.lang.String'
-        elif column_type_lower.startswith('tinyblob'):
-            return 'java.lang.String'
-        elif column_type_lower.startswith('blob'):
-            return 'java.lang.String'
-        elif column_type_lower.startswith('binary'):
-            return 'java.lang.String'
-        elif column_type_lower.startswith('varbinary'):
-            return 'java.lang.String'
-        elif column_type_lower.startswith('enum'):
-            return 'java.lang.String'
-        elif column_type_lower.startswith('set'):
-            return 'java.lang.String'
-        elif column_type_lower.startswith('bool'):
-            return 'java.lang.Boolean'
-        elif column_type_lower.startswith('bit'):
-            return 'java.lang.Boolean'
-        else:
-            return 'java.lang.Object'
+        """Map database column types to Java types using COLUMN_TYPE for more precision
+        (width and unsigned aware, e.g. 'bigint(20) unsigned')"""
+        return self.type_resolver.resolve(column_type)
     
     def validate_table(self, cursor, table_name: str) -> str:
         """Validate if table exists and return actual table name"""
-        cursor.execute("SHOW TABLES")
-        tables = cursor.fetchall()
-        available_tables = [table[0] for table in tables]
+        # SHOW TABLES is run once per connector, not once per validated table
+        if self._available_tables is None:
+            cursor.execute("SHOW TABLES")
+            self._available_tables = [table[0] for table in cursor.fetchall()]
+        available_tables = self._available_tables
         
         # print(f"📋 Available tables in database: {', '.join(available_tables[:10])}")
         # if len(available_tables) > 10:
@@ -190,90 +196,235 @@ class DatabaseConnector:
         
         return table_name
     
-    def fetch_table_metadata(self, table_name: str) -> Dict[str, Any]:
-        """Fetch table column information from MariaDB"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+    def fetch_table_schema(self, cursor, table_name: str) -> Dict[str, Any]:
+        """Fetch raw table schema (table info and column rows) from MariaDB"""
+        # Validate table exists and get actual name
+        actual_table_name = self.validate_table(cursor, table_name)
+        
+        # Get table comment and timestamps used for cache invalidation
+        cursor.execute("""
+            SELECT TABLE_COMMENT, CREATE_TIME, UPDATE_TIME
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = %s
+        """, (actual_table_name,))
         
-        columns = []
-        primary_keys = []
         table_comment = ""
+        create_time = update_time = None
+        table_result = cursor.fetchone()
+        if table_result:
+            table_comment = table_result[0] if table_result[0] else ""
+            create_time, update_time = table_result[1], table_result[2]
+        
+        # MariaDB/MySQL query with column comments
+        cursor.execute("""
+            SELECT 
+                COLUMN_NAME,
+                DATA_TYPE,
+                IS_NULLABLE,
+                COLUMN_KEY,
+                COLUMN_DEFAULT,
+                EXTRA,
+                COLUMN_COMMENT,
+                COLUMN_TYPE
+            FROM INFORMATION_SCHEMA.COLUMNS
+            WHERE TABLE_SCHEMA = DATABASE()
+            AND TABLE_NAME = %s
+            ORDER BY ORDINAL_POSITION
+        """, (actual_table_name,))
+        
+        rows = cursor.fetchall()
         
+        if not rows:
+            raise ValueError(f"Table '{actual_table_name}' not found in database")
+        
+        return {
+            'table_name': actual_table_name,
+            'table_comment': table_comment,
+            'create_time': _to_str(create_time),
+            'update_time': _to_str(update_time),
+            'columns': [list(row) for row in rows]
+        }
+    
+    def _is_cached_schema_fresh(self, schema: Dict[str, Any]) -> bool:
+        """Compare a cached schema with the server's CREATE_TIME/UPDATE_TIME"""
+        conn = self.acquire_connection()
+        cursor = conn.cursor()
         try:
-            # Validate table exists and get actual name
-            actual_table_name = self.validate_table(cursor, table_name)
-            
-            # Get table comment
             cursor.execute("""
-                SELECT TABLE_COMMENT
+                SELECT CREATE_TIME, UPDATE_TIME
                 FROM INFORMATION_SCHEMA.TABLES
                 WHERE TABLE_SCHEMA = DATABASE()
                 AND TABLE_NAME = %s
-            """, (actual_table_name,))
+            """, (schema['table_name'],))
+            result = cursor.fetchone()
+        finally:
+            cursor.close()
+            self.release_connection(conn)
+        
+        return bool(result) and self.schema_cache.is_fresh(schema, result[0], result[1])
+    
+    def load_table_schema(self, table_name: str) -> Dict[str, Any]:
+        """Load raw table schema from the snapshot cache, or from MariaDB on miss"""
+        if self.schema_cache and not self.refresh:
+            schema = self.schema_cache.get(table_name)
+            if schema and (self.trust_cache or self._is_cached_schema_fresh(schema)):
+                print(f"📦 Using cached schema: {schema['table_name']} ({self.schema_cache.path})")
+                return schema
+        
+        conn = self.acquire_connection()
+        cursor = conn.cursor()
+        try:
+            schema = self.fetch_table_schema(cursor, table_name)
+        finally:
+            cursor.close()
+            self.release_connection(conn)
+        
+        if self.schema_cache:
+            self.schema_cache.put(schema)
+            self.schema_cache.save()
+        
+        return schema
+    
+    def load_schemas(self, pattern: Optional[str] = None,
+                     table_names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Load raw schemas of all tables (or tables matching a glob / listed names) in bulk
+        
+        One INFORMATION_SCHEMA.TABLES query lists tables and their timestamps,
+        then a single INFORMATION_SCHEMA.COLUMNS scan fetches columns of every
+        table that is not fresh in the snapshot cache, grouped by table in Python.
+        With table_names, both queries are limited to those tables.
+        """
+        table_sql = """
+            SELECT TABLE_NAME, TABLE_COMMENT, CREATE_TIME, UPDATE_TIME
+            FROM INFORMATION_SCHEMA.TABLES
+            WHERE TABLE_SCHEMA = DATABASE()
+        """
+        table_params = ()
+        if pattern:
+            table_sql += " AND TABLE_NAME LIKE %s"
+            table_params = (glob_to_like(pattern),)
+        if table_names:
+            table_sql += f" AND TABLE_NAME IN ({', '.join(['%s'] * len(table_names))})"
+            table_params += tuple(table_names)
+        table_sql += " ORDER BY TABLE_NAME"
+        
+        conn = self.acquire_connection()
+        cursor = conn.cursor()
+        schemas = {}
+        stale = {}
+        
+        try:
+            cursor.execute(table_sql, table_params)
+            table_rows = cursor.fetchall()
             
-            table_result = cursor.fetchone()
-            if table_result:
-                table_comment = table_result[0] if table_result[0] else ""
+            for table_name, table_comment, create_time, update_time in table_rows:
+                cached = None
+                if self.schema_cache and not self.refresh:
+                    cached = self.schema_cache.get(table_name)
+                if cached and self.schema_cache.is_fresh(cached, create_time, update_time):
+                    schemas[table_name] = cached
+                else:
+                    stale[table_name] = {
+                        'table_name': table_name,
+                        'table_comment': table_comment if table_comment else "",
+                        'create_time': _to_str(create_time),
+                        'update_time': _to_str(update_time),
+                        'columns': []
+                    }
             
-            # MariaDB/MySQL query with column comments
-            cursor.execute("""
-                SELECT 
-                    COLUMN_NAME,
-                    DATA_TYPE,
-                    IS_NULLABLE,
-                    COLUMN_KEY,
-                    COLUMN_DEFAULT,
-                    EXTRA,
-                    COLUMN_COMMENT,
-                    COLUMN_TYPE
-                FROM INFORMATION_SCHEMA.COLUMNS
-                WHERE TABLE_SCHEMA = DATABASE()
-                AND TABLE_NAME = %s
-                ORDER BY ORDINAL_POSITION
-            """, (actual_table_name,))
+            if stale:
+                column_sql = """
+                    SELECT
+                        TABLE_NAME,
+                        COLUMN_NAME,
+                        DATA_TYPE,
+                        IS_NULLABLE,
+                        COLUMN_KEY,
+                        COLUMN_DEFAULT,
+                        EXTRA,
+                        COLUMN_COMMENT,
+                        COLUMN_TYPE
+                    FROM INFORMATION_SCHEMA.COLUMNS
+                    WHERE TABLE_SCHEMA = DATABASE()
+                """
+                if len(stale) < len(table_rows) or table_names:
+                    # Only some tables changed (or were requested) - fetch just those
+                    column_sql += f" AND TABLE_NAME IN ({', '.join(['%s'] * len(stale))})"
+                    column_params = tuple(stale)
+                else:
+                    if pattern:
+                        column_sql += " AND TABLE_NAME LIKE %s"
+                    column_params = table_params
+                column_sql += " ORDER BY TABLE_NAME, ORDINAL_POSITION"
+                
+                cursor.execute(column_sql, column_params)
+                for row in cursor.fetchall():
+                    schema = stale.get(row[0])
+                    if schema is not None:
+                        schema['columns'].append(list(row[1:]))
+        finally:
+            cursor.close()
+            self.release_connection(conn)
+        
+        for table_name, schema in stale.items():
+            if not schema['columns']:
+                continue
+            schemas[table_name] = schema
+            if self.schema_cache:
+                self.schema_cache.put(schema)
+        
+        if self.schema_cache:
+            self.schema_cache.save()
+        
+        print(f"📦 Loaded {len(schemas)} table(s): {len(stale)} from database, "
+              f"{len(schemas) - len(stale)} from cache")
+        return dict(sorted(schemas.items()))
+    
+    def build_table_metadata(self, schema: Dict[str, Any], verbose: bool = True) -> Dict[str, Any]:
+        """Build generator metadata (Java names/types, primary keys) from raw table schema"""
+        actual_table_name = schema['table_name']
+        columns = []
+        primary_keys = []
+        
+        for row in schema['columns']:
+            column_name = row[0]
+            data_type = row[1]
+            is_nullable = row[2] == 'YES'
+            is_primary = row[3] == 'PRI'
+            extra = row[5]
+            column_comment = row[6] if row[6] else ""
+            column_type = row[7]
             
-            rows = cursor.fetchall()
+            # Skip syncTrigger column
+            if column_name == 'syncTrigger':
+                continue
             
-            if not rows:
-                raise ValueError(f"Table '{actual_table_name}' not found in database")
+            # Check if it's auto_increment
+            is_auto_increment = 'auto_increment' in extra.lower() if extra else False
             
-            for row in rows:
-                column_name = row[0]
-                data_type = row[1]
-                is_nullable = row[2] == 'YES'
-                is_primary = row[3] == 'PRI'
-                extra = row[5]
-                column_comment = row[6] if row[6] else ""
-                column_type = row[7]
-                
-                # Skip syncTrigger column
-                if column_name == 'syncTrigger':
-                    continue
-                
-                # Check if it's auto_increment
-                is_auto_increment = 'auto_increment' in extra.lower() if extra else False
-                
-                # Use column_type for more precise type mapping
-                java_type = self.get_java_type_from_column_type(column_type)
-                
-                column_info = {
-                    'db_name': column_name,
-                    'java_name': self.to_camel_case(column_name),
-                    'java_type': java_type,
-                    'is_nullable': is_nullable,
-                    'is_primary': is_primary,
-                    'is_auto_increment': is_auto_increment,
-                    'comment': column_comment,
-                    'column_type': column_type
-                }
-                
-                columns.append(column_info)
-                
-                # Collect all primary keys
-                if is_primary:
-                    primary_keys.append(column_info)
+            # Use column_type for more precise type mapping
+            java_type = self.get_java_type_from_column_type(column_type)
             
-            # Print PK information
+            column_info = {
+                'db_name': column_name,
+                'java_name': self.to_camel_case(column_name),
+                'java_type': java_type,
+                'is_nullable': is_nullable,
+                'is_primary': is_primary,
+                'is_auto_increment': is_auto_increment,
+                'comment': column_comment,
+                'column_type': column_type
+            }
+            
+            columns.append(column_info)
+            
+            # Collect all primary keys
+            if is_primary:
+                primary_keys.append(column_info)
+        
+        # Print PK information
+        if verbose:
             if len(primary_keys) > 1:
                 pk_names = [pk['db_name'] for pk in primary_keys]
                 print(f"🔑 Composite Primary Key found: {', '.join(pk_names)}")
@@ -281,14 +432,26 @@ class DatabaseConnector:
                 print(f"🔑 Primary Key: {primary_keys[0]['db_name']}")
             else:
                 print(f"⚠️  No Primary Key found for table {actual_table_name}")
-                    
-        finally:
-            cursor.close()
-            conn.close()
         
         return {
             'table_name': actual_table_name,
             'columns': columns,
             'primary_keys': primary_keys,
-            'table_comment': table_comment
-        }
\ No newline at end of file
+            'table_comment': schema['table_comment']
+        }
+    
+    def fetch_table_metadata(self, table_name: str) -> Dict[str, Any]:
+        """Fetch table column information from MariaDB (or the schema snapshot cache)"""
+        schema = self.load_table_schema(table_name)
+        return self.build_table_metadata(schema)
+
+    
+    def fetch_schema_metadata(self, pattern: Optional[str] = None,
+                              table_names: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """Fetch metadata of all tables (or tables matching a glob / listed names) keyed by table name
+        
+        Each value has the same shape as fetch_table_metadata() returns.
+        """
+        schemas = self.load_schemas(pattern, table_names)
+        return {table_name: self.build_table_metadata(schema, verbose=False)
+                for table_name, schema in schemas.items()}
@@ -2,8 +2,13 @@
 """
 Main entry point for MyBatis Mapper Generator
 """
+import argparse
+import os
 import sys
-from mapper_generator import MapperGenerator
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from db_connector import DatabaseConnector
+from mapper_generator import MapperGenerator, generate_table
 
 
 def print_banner():
@@ -13,44 +18,149 @@ def print_banner():
     print("=" * 50)
 
 
-def print_usage():
-    """Print usage information"""
-    print("❌ Usage: python main.py <table_name>")
-    print("Example: python main.py app_push")
-    print("\nThis tool generates:")
-    print("  - MyBatis Mapper XML file")
-    print("  - Java Mapper Interface file")
-    print("  - Java Entity Class file")
-    print("\nGenerated files will be saved in 'output/<table_name>/' directory")
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(
+        description="Generate MyBatis Mapper XML, Java Mapper Interface and Java Entity Class files",
+        epilog="Generated files will be saved in 'output/<table_name>/' directory\n"
+               "Examples:\n"
+               "  python main.py app_push\n"
+               "  python main.py app_push app_push_log --jobs 4\n"
+               "  python main.py --pattern 'app_*'\n"
+               "  python main.py --all",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument('tables', nargs='*', metavar='table_name', help="Table name(s) to generate")
+    parser.add_argument('--all', action='store_true', help="Generate files for every table in the database")
+    parser.add_argument('--pattern', metavar='GLOB', help="Generate files for tables matching a glob (e.g. 'app_*')")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="Number of worker processes for batch mode (default: CPU count)")
+    parser.add_argument('--force', action='store_true',
+                        help="Regenerate even if metadata is unchanged since the last run")
+    parser.add_argument('--template-dir', metavar='DIR',
+                        help="Directory with templates overriding the built-in ones (see templates/)")
+    parser.add_argument('--refresh', action='store_true',
+                        help="Ignore the schema snapshot cache and reload from database")
+    parser.add_argument('--trust-cache', action='store_true',
+                        help="Use a cached schema without checking CREATE_TIME/UPDATE_TIME (no query)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Do not read or write the schema snapshot cache")
+    
+    args = parser.parse_args(argv)
+    args.tables = [t.strip() for t in args.tables if t.strip()]
+    
+    if not args.tables and not args.all and not args.pattern:
+        parser.error("table name is required (or use --all / --pattern)")
+    if args.all and args.pattern:
+        parser.error("--all and --pattern cannot be used together")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    
+    return args
 
 
-def main():
-    """Main function"""
-    # Check command line arguments
-    if len(sys.argv) != 2:
-        print_usage()
-        sys.exit(1)
+def generate_single(db_connector: DatabaseConnector, table_name: str, force: bool = False,
+                    template_dir: str = None):
+    """Generate files for a single table"""
+    print(f"Table: {table_name}")
+    print("=" * 50)
     
-    table_name = sys.argv[1].strip()
+    generator = MapperGenerator(table_name, db_connector, template_dir=template_dir)
+    generator.generate(force)
+
+
+def generate_batch(db_connector: DatabaseConnector, args: argparse.Namespace) -> bool:
+    """Generate files for many tables from one bulk metadata load
     
-    if not table_name:
-        print("❌ Table name cannot be empty")
-        print_usage()
-        sys.exit(1)
+    Returns:
+        True if every table was generated successfully
+    """
+    start = time.perf_counter()
+    # Explicit table names limit the bulk load to those tables; --all/--pattern scan the schema
+    metadata_by_table = db_connector.fetch_schema_metadata(args.pattern, args.tables or None)
     
-    print_banner()
-    print(f"Table: {table_name}")
+    failures = {}
+    if args.tables:
+        # Keep only requested tables (case-insensitive, like validate_table)
+        by_lower = {name.lower(): name for name in metadata_by_table}
+        selected = {}
+        for table_name in args.tables:
+            actual_name = by_lower.get(table_name.lower())
+            if actual_name:
+                selected[actual_name] = metadata_by_table[actual_name]
+            else:
+                failures[table_name] = "table not found in database"
+        metadata_by_table = selected
+    
+    load_elapsed = time.perf_counter() - start
+    print(f"⏱️  Metadata loaded in {load_elapsed:.2f}s")
+    print(f"🚀 Generating {len(metadata_by_table)} table(s) with {args.jobs} job(s)")
     print("=" * 50)
     
+    timings = {}
+    skipped = set()
+    if args.jobs == 1 or len(metadata_by_table) <= 1:
+        for table_name, metadata in metadata_by_table.items():
+            try:
+                _, timings[table_name], is_skipped = generate_table(metadata, args.force, args.template_dir)
+                if is_skipped:
+                    skipped.add(table_name)
+            except Exception as e:
+                failures[table_name] = str(e)
+    else:
+        with ProcessPoolExecutor(max_workers=args.jobs) as executor:
+            futures = {executor.submit(generate_table, metadata, args.force, args.template_dir): table_name
+                       for table_name, metadata in metadata_by_table.items()}
+            for future in as_completed(futures):
+                table_name = futures[future]
+                try:
+                    _, timings[table_name], is_skipped = future.result()
+                    if is_skipped:
+                        skipped.add(table_name)
+                except Exception as e:
+                    failures[table_name] = str(e)
+    
+    # Per-table summary in table name order
+    print("\n" + "=" * 50)
+    print("📊 Per-table timing")
+    print("-" * 50)
+    for table_name in sorted(timings):
+        status = "⏭️ " if table_name in skipped else "✅"
+        print(f"  {status} {table_name:<36} {timings[table_name] * 1000:8.1f} ms")
+    for table_name in sorted(failures):
+        print(f"  ❌ {table_name:<36} {failures[table_name]}")
+    print("-" * 50)
+    total_elapsed = time.perf_counter() - start
+    print(f"Success: {len(timings)} (unchanged: {len(skipped)}), Failed: {len(failures)}, "
+          f"Total: {total_elapsed:.2f}s")
+    
+    return not failures
+
+
+def main():
+    """Main function"""
+    args = parse_args()
+    
+    print_banner()
+    
     try:
-        # Generate mapper files
-        generator = MapperGenerator(table_name)
-        xml_path, java_path, entity_path = generator.generate()
+        db_connector = DatabaseConnector(
+            use_cache=not args.no_cache,
+            refresh=args.refresh,
+            trust_cache=args.trust_cache
+        )
+        
+        if args.all or args.pattern or len(args.tables) > 1:
+            if not generate_batch(db_connector, args):
+                print("\n⚠️  Some tables failed to generate")
+                sys.exit(1)
+        else:
+            generate_single(db_connector, args.tables[0], args.force, args.template_dir)
         
         print("\n" + "=" * 50)
         print("✨ Generation completed successfully!")
         print("=" * 50)
-        
+    
     except ValueError as e:
         print(f"\n❌ Validation Error: {e}")
         print("\n💡 Tips:")
@@ -58,7 +168,7 @@ def main():
         print("  - Ensure you have proper database connection")
         print("  - Verify your db.py configuration")
         sys.exit(1)
-        
+    
     except Exception as e:
         print(f"\n❌ Unexpected Error: {e}")
         print("\n💡 Please check:")
@@ -69,4 +179,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,17 +1,55 @@
 """
 MyBatis Mapper XML and Java Interface generator
 """
+import hashlib
+import json
+import time
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 from db_connector import DatabaseConnector
+from template_engine import TemplateLoader
+
+# Templates used by the generator (built-in ones live in templates/)
+TEMPLATE_NAMES = [
+    'mapper.xml.tmpl',
+    'mapper_insert.xml.tmpl',
+    'mapper_update.xml.tmpl',
+    'mapper_delete.xml.tmpl',
+    'mapper_select.xml.tmpl',
+    'mapper_interface.java.tmpl',
+    'mapper_interface_update.java.tmpl',
+    'entity.java.tmpl',
+]
+
+# Per-table manifest of the last generation (output/<table_name>/manifest.json)
+MANIFEST_FILENAME = 'manifest.json'
+
+_fingerprint = None
+
+
+def _generator_fingerprint() -> str:
+    """Hash of this module's source, so generator changes invalidate manifests"""
+    global _fingerprint
+    if _fingerprint is None:
+        _fingerprint = hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+    return _fingerprint
 
 
 class MapperGenerator:
     """Generate MyBatis Mapper XML and Java Interface files"""
     
-    def __init__(self, table_name: str):
-        self.db_connector = DatabaseConnector()
+    def __init__(self, table_name: str, db_connector: DatabaseConnector = None,
+                 metadata: Dict[str, Any] = None, template_dir: str = None):
+        """
+        Args:
+            table_name: Table to generate files for
+            db_connector: Connector used to fetch metadata (default: new DatabaseConnector)
+            metadata: Preloaded metadata (e.g. from DatabaseConnector.fetch_schema_metadata)
+            template_dir: Directory with user templates overriding the built-in ones
+        """
+        self.db_connector = db_connector or DatabaseConnector()
+        self.templates = TemplateLoader(template_dir)
         self.table_name = table_name
         self.entity_name = self.db_connector.to_camel_case(table_name, capitalize=True)
         self.mapper_name = f"{self.entity_name}Mapper"
@@ -19,13 +57,15 @@ class MapperGenerator:
         self.primary_keys = []
         self.table_comment = ""
         self.audit_columns = ['creator', 'createDt', 'updater', 'updateDt']  # Removed syncTrigger
+        self.skipped = False
         
         # Fetch metadata on initialization
-        self._load_metadata()
+        self._load_metadata(metadata)
     
-    def _load_metadata(self):
-        """Load table metadata from database"""
-        metadata = self.db_connector.fetch_table_metadata(self.table_name)
+    def _load_metadata(self, metadata: Dict[str, Any] = None):
+        """Load table metadata from database (unless already loaded in bulk)"""
+        if metadata is None:
+            metadata = self.db_connector.fetch_table_metadata(self.table_name)
         self.table_name = metadata['table_name']  # Use actual table name from DB
         self.columns = metadata['columns']
         self.primary_keys = metadata['primary_keys']
@@ -34,6 +74,16 @@ class MapperGenerator:
         if not self.columns:
             raise ValueError(f"No columns found for table {self.table_name}")
     
+    def render(self, template_name: str, **context) -> str:
+        """Render a template with table-level values plus the given context"""
+        return self.templates.render(
+            template_name,
+            table_name=self.table_name,
+            entity_name=self.entity_name,
+            mapper_name=self.mapper_name,
+            **context
+        )
+    
     def has_update_columns(self) -> bool:
         """Check if table has updater and updateDt columns"""
         column_names = [col['db_name'] for col in self.columns]
@@ -111,14 +161,10 @@ class MapperGenerator:
             pk_java_name = self.primary_keys[0]['java_name']
             generated_keys_attrs = f' useGeneratedKeys="true" keyProperty="{pk_java_name}"'
 
-        return f"""    <insert id="insert"{generated_keys_attrs}>
-        /*{self.mapper_name}.insert*/
-        insert into {self.table_name} (
-{column_list}
-        ) values (
-{value_list}
-        )
-    </insert>"""
+        return self.render('mapper_insert.xml.tmpl',
+                           generated_keys_attrs=generated_keys_attrs,
+                           column_list=column_list,
+                           value_list=value_list)
     
     def generate_update(self) -> str:
         """Generate UPDATE statement"""
@@ -160,13 +206,10 @@ class MapperGenerator:
             where_conditions.append(f"{pk['db_name']} = #{{{pk['java_name']}}}")
         where_clause = '\n        and '.join(where_conditions)
         
-        return f"""    <update id="update">
-        /*{self.mapper_name}.update*/
-        update {self.table_name}
-        set {set_clause_str}
-{update_fields}
-        where {where_clause}
-    </update>"""
+        return self.render('mapper_update.xml.tmpl',
+                           set_clause_str=set_clause_str,
+                           update_fields=update_fields,
+                           where_clause=where_clause)
     
     def generate_delete(self) -> str:
         """Generate DELETE statement"""
@@ -179,11 +222,7 @@ class MapperGenerator:
             where_conditions.append(f"{pk['db_name']} = #{{{pk['java_name']}}}")
         where_clause = '\n        and '.join(where_conditions)
         
-        return f"""    <delete id="delete">
-        /*{self.mapper_name}.delete*/
-        delete from {self.table_name}
-        where {where_clause}
-    </delete>"""
+        return self.render('mapper_delete.xml.tmpl', where_clause=where_clause)
     
     def generate_select(self) -> str:
         """Generate SELECT statement"""
@@ -209,59 +248,28 @@ class MapperGenerator:
         # Use Entity name with CHANGE_THIS_PACKAGE for resultType
         result_type = f"CHANGE_THIS_PACKAGE.{self.entity_name}Entity"
         
-        return f"""    <select id="getByPk" resultType="{result_type}">
-        /*{self.mapper_name}.getByPk*/
-        select
-            {columns_str}
-        from {self.table_name}
-        where {where_clause}
-    </select>
-    
-    <select id="search" resultType="{result_type}">
-        /*{self.mapper_name}.search*/
-        select
-            {columns_str}
-        from {self.table_name}
-        <where>
-        and {where_clause}
-        </where>
-        order by createDt desc
-    </select>    
-    """
+        return self.render('mapper_select.xml.tmpl',
+                           result_type=result_type,
+                           columns_str=columns_str,
+                           where_clause=where_clause)
     
     def generate_mapper_xml(self) -> str:
         """Generate complete Mapper XML file"""
         # Check if UPDATE is needed
         has_update = self.has_update_columns()
         
+        update_section = ""
         if has_update:
-            xml_content = f"""<?xml version="1.0" encoding="UTF-8"?>
-<!DOCTYPE mapper PUBLIC "-//mybatis.org//DTD Mapper 3.0//EN" "http://mybatis.org/dtd/mybatis-3-mapper.dtd">
-<mapper namespace="FILL_THIS_TYPE">
-
-{self.generate_insert()}
-
-{self.generate_update()}
-
-{self.generate_delete()}
-
-{self.generate_select()}
-
-</mapper>"""
+            update_section = f"{self.generate_update()}\n\n"
         else:
             # No UPDATE for tables without updater/updateDt
             print(f"ℹ️  Table {self.table_name} does not have updater/updateDt columns - skipping UPDATE generation")
-            xml_content = f"""<?xml version="1.0" encoding="UTF-8"?>
-<!DOCTYPE mapper PUBLIC "-//mybatis.org//DTD Mapper 3.0//EN" "http://mybatis.org/dtd/mybatis-3-mapper.dtd">
-<mapper namespace="FILL_THIS_TYPE">
-
-{self.generate_insert()}
-
-{self.generate_delete()}
-
-{self.generate_select()}
-
-</mapper>"""
+        
+        xml_content = self.render('mapper.xml.tmpl',
+                                  insert=self.generate_insert(),
+                                  update_section=update_section,
+                                  delete=self.generate_delete(),
+                                  select=self.generate_select())
         
         return xml_content
     
@@ -279,61 +287,12 @@ class MapperGenerator:
         # Generate update method only if needed
         update_method = ""
         if has_update:
-            update_method = f"""
-    /**
-     * {self.table_name} 기본 update 메서드
-     * 
-     * @param entity 입력값
-     * @return 처리 개수
-     */
-    int update({self.entity_name}Entity entity);
-"""
+            update_method = self.render('mapper_interface_update.java.tmpl')
         
-        interface_content = f"""import org.apache.ibatis.annotations.Param;
-import org.springframework.stereotype.Repository;
-
-import java.util.List;
-
-/**
- * {self.table_name} 테이블용 마이바티스 쿼리 매퍼
- */
-@Repository
-public interface {self.mapper_name} {{
-    /**
-     * {self.table_name} 기본 insert 메서드
-     *
-     * @param entity 입력값 
-     * @return 처리 개수
-     */
-    int insert({self.entity_name}Entity entity);
-{update_method}
-    /**
-     * {self.table_name} 기본 delete 메서드
-     *
-{pk_javadoc_params}
-     * @return 처리 개수
-     */
-    int delete({pk_params_with_annotation});
-
-    /**
-     * {self.table_name} 기본 단 건 select 메서드
-     * (다른 테이블과 JOIN 금지)
-     *
-{pk_javadoc_params}
-     * @return 조회 결과
-     */
-    {self.entity_name}Entity getByPk({pk_params_with_annotation});
-    
-    /**
-     * {self.table_name} 기본 여러 건 select 메서드
-     * (다른 테이블과 JOIN 금지)
-     *
-     * @param params 검색 조건
-     * @return 조회 결과
-     */
-    List<{self.entity_name}Entity> search(FILL_THIS_TYPE params);
-
-}}"""
+        interface_content = self.render('mapper_interface.java.tmpl',
+                                        update_method=update_method,
+                                        pk_javadoc_params=pk_javadoc_params,
+                                        pk_params_with_annotation=pk_params_with_annotation)
         
         return interface_content
     
@@ -355,8 +314,8 @@ public interface {self.mapper_name} {{
             # Get simple Java type name (remove package prefix)
             java_type = col['java_type']
             if '.' in java_type:
-                # Keep full name for java.time types and BigDecimal
-                if 'java.time' in java_type or 'BigDecimal' in java_type:
+                # Keep full name for java.time and java.math (BigDecimal, BigInteger) types
+                if 'java.time' in java_type or 'java.math' in java_type:
                     type_name = java_type
                 else:
                     type_name = java_type.split('.')[-1]
@@ -385,55 +344,131 @@ public interface {self.mapper_name} {{
         # Generate class comment
         table_desc = f"{self.table_name} {self.table_comment}" if self.table_comment else self.table_name
         
-        entity_content = f"""{imports_str}
-
-/**
- * {table_desc} 테이블 클래스
- */
-@Getter
-@Setter
-public class {self.entity_name}Entity{extends_clause} {{
-{fields_str}
-}}"""
+        entity_content = self.render('entity.java.tmpl',
+                                     imports_str=imports_str,
+                                     table_desc=table_desc,
+                                     extends_clause=extends_clause,
+                                     fields_str=fields_str)
         
         return entity_content
     
+    @property
+    def output_dir(self) -> Path:
+        """output/<table_name> directory"""
+        return Path("output") / self.table_name
+    
+    def metadata_hash(self) -> str:
+        """Hash of column metadata plus generator source and templates (output changes with any)"""
+        payload = json.dumps({
+            'table_name': self.table_name,
+            'table_comment': self.table_comment,
+            'columns': self.columns,
+            'primary_keys': [pk['db_name'] for pk in self.primary_keys],
+            'generator': _generator_fingerprint(),
+            'templates': self.templates.fingerprint(TEMPLATE_NAMES)
+        }, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def load_manifest(self) -> Dict[str, Any]:
+        """Load output/<table_name>/manifest.json (empty dict if missing or broken)"""
+        try:
+            with open(self.output_dir / MANIFEST_FILENAME, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def save_manifest(self, manifest: Dict[str, Any]):
+        """Write output/<table_name>/manifest.json"""
+        with open(self.output_dir / MANIFEST_FILENAME, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+    
     def save_to_file(self, xml_content: str, java_content: str, entity_content: str):
-        """Save generated XML, Java Interface, and Entity files"""
+        """Save generated XML, Java Interface, and Entity files
+        
+        A file whose content hash matches the previous run (recorded in the
+        manifest) is not rewritten, so its mtime stays untouched.
+        """
         # Create output/<table_name> directory
-        output_dir = Path("output") / self.table_name
+        output_dir = self.output_dir
         output_dir.mkdir(parents=True, exist_ok=True)
         
+        manifest = self.load_manifest()
+        previous_files = manifest.get('files', {})
+        
         # Generate filename with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Save XML file
-        xml_filename = f"{self.mapper_name}_{timestamp}.xml"
-        xml_filepath = output_dir / xml_filename
-        with open(xml_filepath, 'w', encoding='utf-8') as f:
-            f.write(xml_content)
-        
-        # Save Java interface file
-        java_filename = f"{self.mapper_name}_{timestamp}.java"
-        java_filepath = output_dir / java_filename
-        with open(java_filepath, 'w', encoding='utf-8') as f:
-            f.write(java_content)
-        
-        # Save Entity class file
-        entity_filename = f"{self.entity_name}Entity_{timestamp}.java"
-        entity_filepath = output_dir / entity_filename
-        with open(entity_filepath, 'w', encoding='utf-8') as f:
-            f.write(entity_content)
-        
-        print(f"✅ Files generated successfully in output/{self.table_name}/")
+        outputs = [
+            ('xml', f"{self.mapper_name}_{timestamp}.xml", xml_content),
+            ('interface', f"{self.mapper_name}_{timestamp}.java", java_content),
+            ('entity', f"{self.entity_name}Entity_{timestamp}.java", entity_content),
+        ]
+        
+        files = {}
+        filepaths = []
+        written = 0
+        for kind, filename, content in outputs:
+            content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+            previous = previous_files.get(kind, {})
+            if previous.get('hash') == content_hash and (output_dir / previous['filename']).exists():
+                # Same bytes as the previous run - keep the existing file
+                filename = previous['filename']
+            else:
+                with open(output_dir / filename, 'w', encoding='utf-8') as f:
+                    f.write(content)
+                written += 1
+            files[kind] = {'filename': filename, 'hash': content_hash}
+            filepaths.append(output_dir / filename)
+        
+        manifest['metadata_hash'] = self.metadata_hash()
+        manifest['files'] = files
+        self.save_manifest(manifest)
+        
+        xml_filepath, java_filepath, entity_filepath = filepaths
+        if written:
+            print(f"✅ Files generated successfully in output/{self.table_name}/ ({written} written)")
+        else:
+            print(f"⏭️  Output unchanged in output/{self.table_name}/ (nothing written)")
         print(f"📄 XML file: {xml_filepath}")
         print(f"📄 Mapper Interface: {java_filepath}")
         print(f"📄 Entity Class: {entity_filepath}")
         return xml_filepath, java_filepath, entity_filepath
     
-    def generate(self):
-        """Generate XML, Java Interface, and Entity files"""
+    def is_up_to_date(self) -> bool:
+        """Check if metadata is unchanged since the last run and its files still exist"""
+        manifest = self.load_manifest()
+        files = manifest.get('files', {})
+        if manifest.get('metadata_hash') != self.metadata_hash() or len(files) != 3:
+            return False
+        return all((self.output_dir / f['filename']).exists() for f in files.values())
+    
+    def generate(self, force: bool = False):
+        """Generate XML, Java Interface, and Entity files
+        
+        Args:
+            force: If True, render even when metadata is unchanged since the last run
+        """
+        if not force and self.is_up_to_date():
+            self.skipped = True
+            files = self.load_manifest()['files']
+            print(f"⏭️  Metadata unchanged for {self.table_name} - skipping generation")
+            return tuple(self.output_dir / files[kind]['filename']
+                         for kind in ('xml', 'interface', 'entity'))
+        
+        self.skipped = False
         xml_content = self.generate_mapper_xml()
         java_content = self.generate_mapper_interface()
         entity_content = self.generate_entity_class()
-        return self.save_to_file(xml_content, java_content, entity_content)
\ No newline at end of file
+        return self.save_to_file(xml_content, java_content, entity_content)
+
+def generate_table(metadata: Dict[str, Any], force: bool = False,
+                   template_dir: str = None) -> Tuple[Tuple[Path, Path, Path], float, bool]:
+    """Generate files for one table from preloaded metadata (process pool worker)
+    
+    Returns:
+        (generated file paths, elapsed seconds, skipped as unchanged) tuple
+    """
+    start = time.perf_counter()
+    generator = MapperGenerator(metadata['table_name'], metadata=metadata, template_dir=template_dir)
+    paths = generator.generate(force)
+    return paths, time.perf_counter() - start, generator.skipped
@@ -0,0 +1,89 @@
+"""
+Minimal template engine for generated source files
+
+Templates use {{name}} placeholders. They are parsed once into literal/placeholder
+parts and cached per file, so rendering is a single join over the parts.
+"""
+import hashlib
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Built-in templates shipped with the generator
+DEFAULT_TEMPLATE_DIR = Path(__file__).parent / 'templates'
+
+_PLACEHOLDER_PATTERN = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+# Compiled templates shared by every loader in this process, keyed by file path
+_compiled_cache: Dict[Path, 'Template'] = {}
+
+
+class Template:
+    """Compiled template"""
+    
+    def __init__(self, source: str, name: str = '<string>'):
+        self.name = name
+        self.source = source
+        # split() alternates literal text and placeholder names: [lit, name, lit, ...]
+        parts = _PLACEHOLDER_PATTERN.split(source)
+        self._literals = parts[0::2]
+        self._names = parts[1::2]
+    
+    def render(self, context: Dict[str, Any]) -> str:
+        """Render template with context values"""
+        output = [self._literals[0]]
+        for name, literal in zip(self._names, self._literals[1:]):
+            try:
+                output.append(str(context[name]))
+            except KeyError:
+                raise ValueError(f"Template '{self.name}' requires '{name}'") from None
+            output.append(literal)
+        return ''.join(output)
+
+
+class TemplateLoader:
+    """Load templates from a user directory first, then the built-in templates"""
+    
+    def __init__(self, template_dir: Optional[str] = None):
+        self.search_dirs: List[Path] = []
+        if template_dir:
+            self.search_dirs.append(Path(template_dir))
+        self.search_dirs.append(DEFAULT_TEMPLATE_DIR)
+        self._paths: Dict[str, Path] = {}
+    
+    def find(self, name: str) -> Path:
+        """Resolve template file path"""
+        path = self._paths.get(name)
+        if path is not None:
+            return path
+        for directory in self.search_dirs:
+            path = directory / name
+            if path.is_file():
+                self._paths[name] = path
+                return path
+        raise ValueError(f"Template '{name}' not found in {', '.join(map(str, self.search_dirs))}")
+    
+    def get(self, name: str) -> Template:
+        """Get compiled template (parsed once per process)"""
+        path = self.find(name)
+        template = _compiled_cache.get(path)
+        if template is None:
+            source = path.read_text(encoding='utf-8')
+            # A single trailing newline at the end of the file is not part of the template
+            if source.endswith('\n'):
+                source = source[:-1]
+            template = Template(source, name)
+            _compiled_cache[path] = template
+        return template
+    
+    def render(self, name: str, **context) -> str:
+        """Render template by name"""
+        return self.get(name).render(context)
+    
+    def fingerprint(self, names: List[str]) -> str:
+        """Hash of the resolved template sources (changes when any template changes)"""
+        digest = hashlib.sha256()
+        for name in names:
+            digest.update(name.encode('utf-8'))
+            digest.update(self.get(name).source.encode('utf-8'))
+        return digest.hexdigest()
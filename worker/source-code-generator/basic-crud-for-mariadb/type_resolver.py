@@ -0,0 +1,136 @@
+"""
+Column type resolver for mapping MariaDB column types to target language types
+"""
+import re
+from typing import Dict, Optional, Tuple
+
+# base type, optional "(...)" arguments, trailing modifiers (unsigned, zerofill, ...)
+_COLUMN_TYPE_PATTERN = re.compile(r'^\s*([a-z]+)\s*(?:\(([^)]*)\))?\s*(.*)$')
+
+# Types whose "(...)" holds literal values, not width/precision
+_VALUE_LIST_TYPES = {'enum', 'set'}
+
+# MariaDB to Java type mapping
+# Keys are tried from most to least specific:
+#   'base(args) unsigned' -> 'base(args)' -> 'base unsigned' -> 'base'
+JAVA_TYPE_MAPPING = {
+    # Numeric types
+    'tinyint': 'java.lang.Boolean',  # Changed to Boolean as per requirement
+    'smallint': 'java.lang.Integer',
+    'mediumint': 'java.lang.Integer',
+    'int': 'java.lang.Integer',
+    'integer': 'java.lang.Integer',
+    'int unsigned': 'java.lang.Long',  # Exceeds Integer.MAX_VALUE
+    'integer unsigned': 'java.lang.Long',
+    'bigint': 'java.lang.Long',  # Also bigint unsigned (register('bigint unsigned', 'java.math.BigInteger') to opt in)
+    'decimal': 'java.math.BigDecimal',
+    'numeric': 'java.math.BigDecimal',
+    'float': 'java.lang.Float',
+    'double': 'java.lang.Double',
+    'real': 'java.lang.Double',
+    
+    # String types
+    'varchar': 'java.lang.String',
+    'char': 'java.lang.String',
+    'tinytext': 'java.lang.String',
+    'text': 'java.lang.String',
+    'mediumtext': 'java.lang.String',
+    'longtext': 'java.lang.String',
+    'enum': 'java.lang.String',
+    'set': 'java.lang.String',
+    
+    # Date/Time types
+    'date': 'java.time.LocalDate',
+    'datetime': 'java.time.LocalDateTime',
+    'timestamp': 'java.time.LocalDateTime',
+    'time': 'java.time.LocalTime',
+    
+    # Boolean
+    'bool': 'java.lang.Boolean',
+    'boolean': 'java.lang.Boolean',
+    'bit': 'java.lang.Boolean',
+    
+    # Binary
+    'tinyblob': 'java.lang.String',  # Changed to String as per requirement
+    'blob': 'java.lang.String',
+    'mediumblob': 'java.lang.String',
+    'longblob': 'java.lang.String',
+    'binary': 'java.lang.String',
+    'varbinary': 'java.lang.String',
+}
+
+
+def parse_column_type(column_type: str) -> Tuple[str, Optional[str], bool]:
+    """Parse COLUMN_TYPE (e.g. 'bigint(20) unsigned') into (base, args, unsigned)"""
+    match = _COLUMN_TYPE_PATTERN.match(column_type.lower())
+    if not match:
+        return column_type.lower().strip(), None, False
+    
+    base, args, modifiers = match.groups()
+    if base in _VALUE_LIST_TYPES:
+        return base, None, False
+    
+    args = args.replace(' ', '') if args is not None else None
+    return base, args, 'unsigned' in modifiers.split()
+
+
+class TypeResolver:
+    """Resolve column types to target language types
+    
+    Every distinct COLUMN_TYPE string is parsed once; later lookups are a
+    single dict hit, so resolving a whole schema is O(1) per column.
+    """
+    
+    def __init__(self, mapping: Dict[str, str], default: str):
+        self.mapping = dict(mapping)
+        self.default = default
+        self._resolved = {}
+    
+    def register(self, key: str, target_type: str):
+        """Add or override a mapping (e.g. register('tinyint(4)', 'java.lang.Integer'))"""
+        self.mapping[key.lower()] = target_type
+        self._resolved.clear()
+    
+    def resolve(self, column_type: str) -> str:
+        """Map COLUMN_TYPE or DATA_TYPE to target type"""
+        target_type = self._resolved.get(column_type)
+        if target_type is None:
+            target_type = self._resolve_uncached(column_type)
+            self._resolved[column_type] = target_type
+        return target_type
+    
+    def _resolve_uncached(self, column_type: str) -> str:
+        base, args, unsigned = parse_column_type(column_type)
+        
+        candidates = []
+        if args is not None:
+            if unsigned:
+                candidates.append(f"{base}({args}) unsigned")
+            candidates.append(f"{base}({args})")
+        if unsigned:
+            candidates.append(f"{base} unsigned")
+        candidates.append(base)
+        
+        for key in candidates:
+            target_type = self.mapping.get(key)
+            if target_type is not None:
+                return target_type
+        return self.default
+
+
+_RESOLVERS = {
+    'java': TypeResolver(JAVA_TYPE_MAPPING, 'java.lang.Object'),
+}
+
+
+def register_type_resolver(language: str, resolver: TypeResolver):
+    """Register a resolver for another target language (e.g. 'kotlin')"""
+    _RESOLVERS[language] = resolver
+
+
+def get_type_resolver(language: str = 'java') -> TypeResolver:
+    """Get the resolver for a target language"""
+    resolver = _RESOLVERS.get(language)
+    if resolver is None:
+        raise ValueError(f"No type resolver registered for language '{language}'")
+    return resolver
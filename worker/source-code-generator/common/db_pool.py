@@ -0,0 +1,154 @@
+"""
+Small thread-safe connection pool shared by the code generators
+
+Usage:
+    pool = ConnectionPool(create_connection, max_size=4)
+    with pool.connection() as conn:
+        ...
+"""
+import atexit
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, List, Optional, Tuple
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available in time"""
+
+
+class ConnectionPool:
+    """Reuse a few warm DB-API connections instead of connecting per call
+    
+    - max_size: upper bound of open connections (idle + in use)
+    - idle_timeout: idle connections older than this (seconds) are closed
+    - health_check_interval: idle connections unused for longer than this are
+      pinged before reuse; dead ones are replaced
+    """
+    
+    def __init__(self, create_connection: Callable[[], Any], max_size: int = 4,
+                 idle_timeout: float = 300.0, health_check_interval: float = 30.0):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.create_connection = create_connection
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.health_check_interval = health_check_interval
+        self._idle: List[Tuple[Any, float]] = []  # (connection, released at), most recent last
+        self._in_use = 0
+        self._lock = threading.Condition()
+        self._closed = False
+        self.created = 0
+        self.reused = 0
+        atexit.register(self.close)
+    
+    @property
+    def size(self) -> int:
+        """Number of open connections (idle + in use)"""
+        return len(self._idle) + self._in_use
+    
+    def _evict_idle(self, now: float):
+        """Close idle connections past idle_timeout (caller holds the lock)"""
+        alive = []
+        for conn, released_at in self._idle:
+            if now - released_at > self.idle_timeout:
+                _close_quietly(conn)
+            else:
+                alive.append((conn, released_at))
+        self._idle = alive
+    
+    def _is_healthy(self, conn, released_at: float, now: float) -> bool:
+        """Ping connections that sat idle long enough to have been dropped"""
+        if now - released_at <= self.health_check_interval:
+            return True
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+    
+    def acquire(self, timeout: Optional[float] = None):
+        """Get an idle connection or open a new one (waits when max_size is reached)"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                
+                now = time.monotonic()
+                self._evict_idle(now)
+                
+                while self._idle:
+                    conn, released_at = self._idle.pop()
+                    if self._is_healthy(conn, released_at, now):
+                        self._in_use += 1
+                        self.reused += 1
+                        return conn
+                    _close_quietly(conn)
+                
+                if self.size < self.max_size:
+                    # Reserve the slot, then connect outside the lock
+                    self._in_use += 1
+                    break
+                
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise PoolTimeoutError(f"No connection available within {timeout}s")
+                self._lock.wait(remaining)
+        
+        try:
+            conn = self.create_connection()
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+        
+        with self._lock:
+            self.created += 1
+        return conn
+    
+    def release(self, conn, discard: bool = False):
+        """Return a connection to the pool (discard=True closes it instead)"""
+        if not discard:
+            try:
+                # End the transaction so the next user doesn't see an old snapshot
+                conn.rollback()
+            except Exception:
+                discard = True
+        
+        with self._lock:
+            self._in_use -= 1
+            if discard or self._closed:
+                _close_quietly(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._lock.notify()
+    
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Context manager: acquire, yield, release (connection discarded on error)"""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
+        except Exception:
+            self.release(conn, discard=True)
+            raise
+        self.release(conn)
+    
+    def close(self):
+        """Close idle connections and stop handing out new ones"""
+        with self._lock:
+            self._closed = True
+            for conn, _ in self._idle:
+                _close_quietly(conn)
+            self._idle = []
+            self._lock.notify_all()
+
+
+def _close_quietly(conn):
+    """Close a connection ignoring errors (it may already be dead)"""
+    try:
+        conn.close()
+    except Exception:
+        pass
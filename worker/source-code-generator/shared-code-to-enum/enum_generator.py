@@ -3,11 +3,26 @@ Enum Generator Module
 Generates Java enum classes from MariaDB code tables
 """
 
+import os
 import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import List, Dict, Tuple, Optional
 import pymysql
 from db import DB_CONFIG, DB_TYPE
 
+# 코드 생성기 공용 모듈 (../common)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'common'))
+from db_pool import ConnectionPool
+
+# 스트리밍 조회 시 한 번에 가져올 행 수
+FETCH_BATCH_SIZE = 1000
+
+# 프로세스 안에서 공유하는 커넥션 풀
+_connection_pool: Optional[ConnectionPool] = None
+
 
 def get_db_connection():
     """데이터베이스 연결 생성"""
@@ -23,6 +38,24 @@ def get_db_connection():
     )
 
 
+def get_connection_pool() -> ConnectionPool:
+    """
+    공유 커넥션 풀 반환 (처음 호출할 때 생성)
+    
+    Returns:
+        get_db_connection으로 연결을 만드는 ConnectionPool
+    """
+    global _connection_pool
+    if _connection_pool is None:
+        config = DB_CONFIG[DB_TYPE]
+        _connection_pool = ConnectionPool(
+            get_db_connection,
+            max_size=config.get('pool_max_size', 4),
+            idle_timeout=config.get('pool_idle_timeout', 300)
+        )
+    return _connection_pool
+
+
 def fetch_code_data(code_name: str) -> Tuple[Dict, List[Dict]]:
     """
     특정 코드의 데이터를 가져옴
@@ -33,8 +66,7 @@ def fetch_code_data(code_name: str) -> Tuple[Dict, List[Dict]]:
     Returns:
         (code 정보, code_item 리스트) 튜플
     """
-    conn = get_db_connection()
-    try:
+    with get_connection_pool().connection() as conn:
         with conn.cursor() as cursor:
             # code 테이블 조회
             cursor.execute(
@@ -51,8 +83,52 @@ def fetch_code_data(code_name: str) -> Tuple[Dict, List[Dict]]:
             code_items = cursor.fetchall()
             
             return code_info, code_items
-    finally:
-        conn.close()
+
+
+def _stream_rows(cursor, batch_size: int = FETCH_BATCH_SIZE):
+    """서버 사이드 커서에서 batch_size 단위로 행을 읽어 하나씩 반환"""
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            break
+        yield from rows
+
+
+def _prefix_condition(prefix: Optional[str]) -> Tuple[str, tuple]:
+    """code 접두어 조건 (WHERE 절, 파라미터) 생성"""
+    if not prefix:
+        return "", ()
+    escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return " WHERE code LIKE %s", (escaped + '%',)
+
+
+def fetch_all_code_data(prefix: Optional[str] = None) -> List[Tuple[Dict, List[Dict]]]:
+    """
+    모든 코드의 데이터를 쿼리 두 번으로 가져옴
+    
+    code, code_item 테이블을 각각 서버 사이드 커서로 한 번씩 읽고
+    code_item은 메모리에서 코드별로 묶음
+    
+    Args:
+        prefix: 이 접두어로 시작하는 코드만 조회 (없으면 전체)
+        
+    Returns:
+        (code 정보, code_item 리스트) 튜플의 리스트 (code 순)
+    """
+    items_by_code: Dict[str, List[Dict]] = {}
+    where, params = _prefix_condition(prefix)
+    
+    with get_connection_pool().connection() as conn:
+        with conn.cursor(pymysql.cursors.SSDictCursor) as cursor:
+            cursor.execute(f"SELECT * FROM code{where} ORDER BY code", params)
+            codes = list(_stream_rows(cursor))
+        
+        with conn.cursor(pymysql.cursors.SSDictCursor) as cursor:
+            cursor.execute(f"SELECT * FROM code_item{where} ORDER BY code, sortOrder", params)
+            for item in _stream_rows(cursor):
+                items_by_code.setdefault(item['code'], []).append(item)
+    
+    return [(code_info, items_by_code.get(code_info['code'], [])) for code_info in codes]
 
 
 def to_enum_name(code_key: str, code_value: str, index: int) -> str:
@@ -155,7 +231,23 @@ def generate_enum_class(code_name: str, code_items: List[Dict]) -> str:
     return f"{javadoc}\n{class_body}"
 
 
-def save_enum_to_file(code_name: str, enum_code: str, output_dir: str = './output') -> str:
+def enum_file_path(code_name: str, output_dir: str = './output') -> str:
+    """
+    enum 파일 경로 생성 (한글 그대로 사용하되 특수문자 제거)
+    
+    Args:
+        code_name: 코드 이름
+        output_dir: 출력 디렉토리
+        
+    Returns:
+        파일 경로
+    """
+    safe_filename = re.sub(r'[^\w가-힣]', '', code_name)
+    return os.path.join(output_dir, f"{safe_filename}.java")
+
+
+def save_enum_to_file(code_name: str, enum_code: str, output_dir: str = './output',
+                      create_dir: bool = True) -> str:
     """
     생성된 enum 코드를 파일로 저장
     
@@ -163,18 +255,16 @@ def save_enum_to_file(code_name: str, enum_code: str, output_dir: str = './outpu
         code_name: 코드 이름
         enum_code: 생성된 Java enum 코드
         output_dir: 출력 디렉토리
+        create_dir: 출력 디렉토리를 생성할지 여부 (일괄 생성 시 미리 한 번만 생성)
         
     Returns:
         저장된 파일 경로
     """
-    import os
-    
     # 출력 디렉토리 생성
-    os.makedirs(output_dir, exist_ok=True)
+    if create_dir:
+        os.makedirs(output_dir, exist_ok=True)
     
-    # 파일명 생성 (한글 그대로 사용하되 특수문자 제거)
-    safe_filename = re.sub(r'[^\w가-힣]', '', code_name)
-    file_path = os.path.join(output_dir, f"{safe_filename}.java")
+    file_path = enum_file_path(code_name, output_dir)
     
     # 파일 저장
     with open(file_path, 'w', encoding='utf-8') as f:
@@ -198,39 +288,102 @@ def generate_enum_from_db(code_name: str, save_to_file: bool = True) -> str:
         # 데이터베이스에서 코드 정보 조회
         code_info, code_items = fetch_code_data(code_name)
         
-        if not code_info:
-            raise ValueError(f"코드 '{code_name}'를 찾을 수 없습니다.")
-        
-        if not code_items:
-            raise ValueError(f"코드 '{code_name}'에 대한 아이템이 없습니다.")
-        
-        # Enum 클래스 생성
-        enum_code = generate_enum_class(code_name, code_items)
-        
-        # 파일로 저장
-        if save_to_file:
-            file_path = save_enum_to_file(code_name, enum_code)
-            print(f"✅ Enum 클래스가 생성되었습니다: {file_path}")
-        
-        return enum_code
+        return generate_enum(code_name, code_info, code_items, save_to_file)
         
     except Exception as e:
         print(f"❌ 오류 발생: {e}")
         raise
 
 
-def list_available_codes() -> List[str]:
+def generate_enum(code_name: str, code_info: Optional[Dict], code_items: List[Dict],
+                  save_to_file: bool = True) -> str:
+    """
+    이미 조회한 코드 데이터로 Java enum 생성
+    
+    Args:
+        code_name: 생성할 코드 이름
+        code_info: code 테이블 행 (없으면 None)
+        code_items: code_item 리스트 (sortOrder 순)
+        save_to_file: 파일로 저장할지 여부
+        
+    Returns:
+        생성된 Java enum 코드
+    """
+    if not code_info:
+        raise ValueError(f"코드 '{code_name}'를 찾을 수 없습니다.")
+    
+    if not code_items:
+        raise ValueError(f"코드 '{code_name}'에 대한 아이템이 없습니다.")
+    
+    # Enum 클래스 생성
+    enum_code = generate_enum_class(code_name, code_items)
+    
+    # 파일로 저장
+    if save_to_file:
+        file_path = save_enum_to_file(code_name, enum_code)
+        print(f"✅ Enum 클래스가 생성되었습니다: {file_path}")
+    
+    return enum_code
+
+
+def list_available_codes(prefix: Optional[str] = None) -> List[str]:
     """
     사용 가능한 모든 코드 목록 조회
     
+    Args:
+        prefix: 이 접두어로 시작하는 코드만 조회 (없으면 전체)
+        
     Returns:
         코드 이름 리스트
     """
-    conn = get_db_connection()
-    try:
+    where, params = _prefix_condition(prefix)
+    with get_connection_pool().connection() as conn:
         with conn.cursor() as cursor:
-            cursor.execute("SELECT code, codeName, description FROM code ORDER BY code")
+            cursor.execute(f"SELECT code, codeName, description FROM code{where} ORDER BY code", params)
             codes = cursor.fetchall()
             return codes
-    finally:
-        conn.close()
\ No newline at end of file
+
+
+def _render_and_save(code_info: Dict, code_items: List[Dict], output_dir: str,
+                     dry_run: bool = False) -> Tuple[str, Optional[str], Optional[str]]:
+    """일괄 생성 작업 단위: (코드 이름, 저장 경로, 오류 메시지) 반환"""
+    code_name = code_info['code']
+    try:
+        if not code_items:
+            raise ValueError(f"코드 '{code_name}'에 대한 아이템이 없습니다.")
+        enum_code = generate_enum_class(code_name, code_items)
+        if dry_run:
+            return code_name, enum_file_path(code_name, output_dir), None
+        file_path = save_enum_to_file(code_name, enum_code, output_dir, create_dir=False)
+        return code_name, file_path, None
+    except Exception as e:
+        return code_name, None, str(e)
+
+
+def generate_enums(code_data: List[Tuple[Dict, List[Dict]]], jobs: int = 1, output_dir: str = './output',
+                   dry_run: bool = False) -> Tuple[List[Tuple[str, Optional[str], Optional[str]]], float]:
+    """
+    조회해 둔 코드 데이터로 Enum을 생성/저장 (jobs > 1이면 스레드 풀로 병렬 처리)
+    
+    Args:
+        code_data: fetch_all_code_data() 결과
+        jobs: 동시에 처리할 작업 수
+        output_dir: 출력 디렉토리
+        dry_run: True면 생성만 하고 파일은 쓰지 않음 (저장될 경로를 반환)
+        
+    Returns:
+        ((코드 이름, 저장 경로, 오류 메시지) 리스트 - code_data와 같은 순서, 소요 시간(초)) 튜플
+    """
+    start = time.perf_counter()
+    if not dry_run:
+        os.makedirs(output_dir, exist_ok=True)
+    
+    if jobs <= 1:
+        results = [_render_and_save(info, items, output_dir, dry_run) for info, items in code_data]
+    else:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            # map()은 입력 순서대로 결과를 돌려주므로 요약 순서가 항상 같음
+            results = list(executor.map(
+                lambda data: _render_and_save(data[0], data[1], output_dir, dry_run), code_data))
+    
+    return results, time.perf_counter() - start
@@ -4,13 +4,28 @@ MariaDB to Java Enum Generator
 Main entry point for generating Java enum classes from database code tables
 """
 
+import argparse
+import json
 import sys
+import pymysql
 from enum_generator import (
     generate_enum_from_db, 
+    generate_enum,
+    generate_enums,
+    fetch_code_data,
+    fetch_all_code_data,
     list_available_codes,
+    save_enum_to_file,
+    enum_file_path,
     get_db_connection
 )
 
+# 종료 코드
+EXIT_OK = 0
+EXIT_FAILED = 1      # Enum 생성 실패 (일부 실패 포함) 또는 코드 없음
+EXIT_USAGE = 2       # 잘못된 명령행 인자 (argparse 기본값)
+EXIT_DB_ERROR = 3    # DB 연결/조회 실패
+
 
 def print_banner():
     """프로그램 배너 출력"""
@@ -77,39 +92,159 @@ def generate_single_enum():
         print(f"❌ Enum 생성 실패: {e}")
 
 
-def generate_all_enums():
+def generate_all_enums(jobs: int = 1):
     """모든 코드에 대한 Enum 일괄 생성"""
     try:
-        codes = list_available_codes()
-        if not codes:
+        # code, code_item 전체를 쿼리 두 번으로 조회
+        code_data = fetch_all_code_data()
+        if not code_data:
             print("생성할 코드가 없습니다.")
             return
         
-        success_count = 0
-        fail_count = 0
-        
-        print(f"\n총 {len(codes)}개의 Enum을 생성합니다...")
+        print(f"\n총 {len(code_data)}개의 Enum을 생성합니다... (작업 수: {jobs})")
         print("-" * 60)
         
-        for code in codes:
-            code_name = code['code']
-            try:
-                generate_enum_from_db(code_name, save_to_file=True)
-                success_count += 1
-                print(f"✅ {code_name} -> 성공")
-            except Exception as e:
-                fail_count += 1
-                print(f"❌ {code_name} -> 실패: {e}")
-        
-        print("-" * 60)
-        print(f"\n📊 결과: 성공 {success_count}개, 실패 {fail_count}개")
+        results, elapsed = generate_enums(code_data, jobs=jobs)
+        print_generate_summary(results, elapsed)
         
     except Exception as e:
         print(f"❌ 일괄 생성 중 오류 발생: {e}")
 
 
+def print_generate_summary(results, elapsed: float):
+    """일괄 생성 결과 출력 (코드 순서)"""
+    success_count = 0
+    fail_count = 0
+    for code_name, file_path, error in results:
+        if error is None:
+            success_count += 1
+            print(f"✅ {code_name} -> 성공 ({file_path})")
+        else:
+            fail_count += 1
+            print(f"❌ {code_name} -> 실패: {error}")
+    
+    throughput = len(results) / elapsed if elapsed > 0 else 0
+    print("-" * 60)
+    print(f"\n📊 결과: 성공 {success_count}개, 실패 {fail_count}개")
+    print(f"⏱️  {elapsed:.2f}초, {throughput:,.1f} enums/sec")
+
+
+def print_json(data):
+    """JSON 요약 출력"""
+    print(json.dumps(data, ensure_ascii=False, indent=2, default=str))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """명령행 인자 정의 (명령 없이 실행하면 대화형 메뉴)"""
+    parser = argparse.ArgumentParser(
+        description="MariaDB 코드 테이블로 Java Enum 생성 (명령 없이 실행하면 대화형 메뉴)",
+        epilog="종료 코드: 0 성공, 1 생성 실패/코드 없음, 2 잘못된 인자, 3 DB 오류"
+    )
+    parser.add_argument('--jobs', type=int, default=1, help="일괄 생성 작업 수 (기본 1)")
+    
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--json', action='store_true', help="결과를 JSON으로 출력")
+    
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument('--output-dir', default='./output', help="출력 디렉토리 (기본 ./output)")
+    output.add_argument('--dry-run', action='store_true', help="생성만 하고 파일은 쓰지 않음")
+    
+    subparsers = parser.add_subparsers(dest='command')
+    
+    list_parser = subparsers.add_parser('list', parents=[common], help="코드 목록 조회")
+    list_parser.add_argument('--prefix', help="이 접두어로 시작하는 코드만 조회")
+    
+    generate_parser = subparsers.add_parser('generate', parents=[common, output], help="특정 코드의 Enum 생성")
+    generate_parser.add_argument('code', help="생성할 코드 이름")
+    
+    all_parser = subparsers.add_parser('generate-all', parents=[common, output], help="모든 코드의 Enum 일괄 생성")
+    all_parser.add_argument('--prefix', help="이 접두어로 시작하는 코드만 생성")
+    all_parser.add_argument('--jobs', type=int, default=argparse.SUPPRESS, help="동시에 처리할 작업 수")
+    
+    return parser
+
+
+def run_list(args) -> int:
+    """list 명령"""
+    codes = list_available_codes(args.prefix)
+    if args.json:
+        print_json({'command': 'list', 'count': len(codes), 'codes': codes})
+    else:
+        for code in codes:
+            description = code.get('description', '-') or '-'
+            print(f"{code['code']:<30} {code['codeName']:<20} {description:<20}")
+    return EXIT_OK
+
+
+def run_generate(args) -> int:
+    """generate 명령"""
+    code_info, code_items = fetch_code_data(args.code)
+    file_path = None
+    error = None
+    try:
+        enum_code = generate_enum(args.code, code_info, code_items, save_to_file=False)
+        if args.dry_run:
+            file_path = enum_file_path(args.code, args.output_dir)
+        else:
+            file_path = save_enum_to_file(args.code, enum_code, args.output_dir)
+    except ValueError as e:
+        error = str(e)
+    
+    if args.json:
+        print_json({'command': 'generate', 'code': args.code, 'dry_run': args.dry_run,
+                    'file': file_path, 'error': error})
+    elif error:
+        print(f"❌ {args.code} -> 실패: {error}")
+    elif args.dry_run:
+        print(enum_code)
+    else:
+        print(f"✅ {args.code} -> 성공 ({file_path})")
+    return EXIT_FAILED if error else EXIT_OK
+
+
+def run_generate_all(args) -> int:
+    """generate-all 명령"""
+    code_data = fetch_all_code_data(args.prefix)
+    results, elapsed = generate_enums(code_data, jobs=max(1, args.jobs),
+                                      output_dir=args.output_dir, dry_run=args.dry_run)
+    failed = [r for r in results if r[2] is not None]
+    
+    if args.json:
+        print_json({
+            'command': 'generate-all',
+            'dry_run': args.dry_run,
+            'total': len(results),
+            'success': len(results) - len(failed),
+            'failed': len(failed),
+            'elapsed_sec': round(elapsed, 3),
+            'enums_per_sec': round(len(results) / elapsed, 1) if elapsed > 0 else None,
+            'results': [{'code': code, 'file': path, 'error': error} for code, path, error in results]
+        })
+    else:
+        print_generate_summary(results, elapsed)
+    
+    if not results:
+        return EXIT_FAILED
+    return EXIT_FAILED if failed else EXIT_OK
+
+
+def run_command(args) -> int:
+    """비대화형 명령 실행 (시작 시 DB 연결 테스트 없음)"""
+    commands = {'list': run_list, 'generate': run_generate, 'generate-all': run_generate_all}
+    try:
+        return commands[args.command](args)
+    except pymysql.MySQLError as e:
+        print(f"❌ 데이터베이스 오류: {e}", file=sys.stderr)
+        return EXIT_DB_ERROR
+
+
 def main():
     """메인 함수"""
+    args = build_parser().parse_args()
+    if args.command:
+        sys.exit(run_command(args))
+    
+    jobs = max(1, args.jobs)
     print_banner()
     
     # 초기 DB 연결 테스트
@@ -130,7 +265,7 @@ def main():
         elif choice == '2':
             generate_single_enum()
         elif choice == '3':
-            generate_all_enums()
+            generate_all_enums(jobs)
         elif choice == '4':
             test_db_connection()
         else: